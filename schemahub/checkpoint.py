@@ -1,27 +1,109 @@
 """Checkpoint management for backfill operations."""
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
 import logging
 import os
+import random
+import sched
 import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
 
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from schemahub.config import (
+    AWS_MAX_ATTEMPTS,
+    AWS_RETRY_MODE,
+    CHECKPOINT_FLUSH_EVERY_N,
+    LOCK_HEARTBEAT_STALE_FRACTION,
+    LOCK_RETRY_BASE_DELAY_SECONDS,
+    LOCK_RETRY_MAX_DELAY_SECONDS,
+    MIN_CHECKPOINT_INTERVAL_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
+# Shared by every LockManager/CheckpointManager so repeated manager creation
+# reuses one client (and its keep-alive connection pool) per service.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    retries={"mode": AWS_RETRY_MODE, "total_max_attempts": AWS_MAX_ATTEMPTS},
+)
+_client_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _session() -> boto3.session.Session:
+    """Return the process-wide boto3 session."""
+    return boto3.session.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _dynamodb_client():
+    """Return the process-wide DynamoDB client."""
+    with _client_lock:  # Sessions are not thread-safe for client creation
+        return _session().client("dynamodb", config=_CLIENT_CONFIG)
+
+
+@functools.lru_cache(maxsize=None)
+def _s3_client():
+    """Return the process-wide S3 client."""
+    with _client_lock:
+        return _session().client("s3", config=_CLIENT_CONFIG)
+
+
+def _next_delay(prev: float, cap: float) -> float:
+    """Return the next lock retry delay using decorrelated jitter.
+
+    Each delay is drawn from [base, prev * 3] and clamped to ``cap``, so
+    contending workers spread their retries out instead of waking in lock-step
+    (see AWS "Exponential Backoff and Jitter").
+    """
+    return min(cap, random.uniform(LOCK_RETRY_BASE_DELAY_SECONDS, prev * 3))
+
+
+# DynamoDB caps TransactWriteItems at 100 actions per request
+_TRANSACT_MAX_ITEMS = 100
+
+
+def _utc_timestamp(epoch: Optional[float] = None) -> str:
+    """Return ``epoch`` (default: now) as a UTC ISO8601 string with a ``Z`` suffix."""
+    dt = datetime.now(timezone.utc) if epoch is None else datetime.fromtimestamp(epoch, timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _checkpoint_hash(checkpoint: dict) -> str:
+    """Digest of a checkpoint's content, ignoring the ``last_updated`` timestamp."""
+    payload = {k: v for k, v in checkpoint.items() if k != "last_updated"}
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class _LockState:
+    """Per-lock bookkeeping for a LockManager (one entry per held lock)."""
+
+    acquired_at: float  # time.monotonic() at acquire
+    renewal: Optional[sched.Event] = None  # Pending renewal on the shared scheduler
+    last_heartbeat: Optional[float] = None  # time.monotonic() of the last heartbeat()
+
 
 class LockManager:
     """Distributed lock manager using DynamoDB conditional writes.
     
     Provides atomic lock acquisition with TTL-based auto-release for crash recovery.
     Uses conditional writes to ensure only one holder can acquire a lock.
-    Automatically renews locks in a background thread to prevent expiration during long jobs.
+    Automatically renews locks on a single shared background thread to prevent
+    expiration during long jobs.
     
     Lock scopes:
         - "ingest": Covers both incremental ingest and full_refresh backfill
@@ -34,6 +116,11 @@ class LockManager:
         renewal_interval: How often to renew locks (default: ttl/2)
     """
 
+    # One scheduler thread services renewals for every lock in the process
+    _scheduler: Optional[sched.scheduler] = None
+    _scheduler_wakeup: Optional[threading.Event] = None
+    _scheduler_lock = threading.Lock()
+
     def __init__(self, table_name: str, ttl_seconds: int = 21600):
         """Initialize lock manager.
         
@@ -44,12 +131,29 @@ class LockManager:
         self.table_name = table_name
         self.ttl_seconds = ttl_seconds
         self.lock_id = str(uuid.uuid4())
-        self.dynamodb = boto3.client("dynamodb")
-        self._held_locks: set[str] = set()
-        self._renewal_threads: dict[str, threading.Thread] = {}
-        self._stop_events: dict[str, threading.Event] = {}
+        self.dynamodb = _dynamodb_client()
+        # Static request fragments, reused by every acquire/renew/release call
+        self._lock_id_attr = {"S": self.lock_id}
+        self._ttl_names = {"#ttl": "ttl"}
+        self._id_expr_val = {":id": self._lock_id_attr}
+        self._locks: dict[str, _LockState] = {}
+        self._state_lock = threading.Lock()
         self.renewal_interval = ttl_seconds // 2  # Renew at half TTL (3 hours for 6h TTL)
 
+    def warmup(self) -> None:
+        """Open the DynamoDB connection ahead of the first lock operation.
+
+        Resolves credentials and completes DNS/TCP/TLS setup with a cheap
+        DescribeEndpoints call, so the first conditional PutItem reuses a warm
+        pooled connection. Failures are ignored; acquire() surfaces real errors.
+        """
+        start = time.monotonic()
+        try:
+            self.dynamodb.describe_endpoints()
+        except Exception as e:
+            logger.debug(f"DynamoDB warmup call failed (ignored): {e}")
+        logger.debug(f"DynamoDB warmup took {time.monotonic() - start:.3f}s")
+
     def acquire(self, lock_name: str, wait: bool = False, timeout: int = 60) -> bool:
         """Attempt to acquire a named lock.
         
@@ -61,122 +165,136 @@ class LockManager:
         Returns:
             True if lock acquired, False otherwise
         """
-        ttl_epoch = int(time.time()) + self.ttl_seconds
-        start_time = time.time()
+        # Monotonic deadline so wall-clock (NTP) jumps can't stretch or cut the wait
+        deadline = time.monotonic() + timeout
+        delay = LOCK_RETRY_BASE_DELAY_SECONDS
         
         while True:
+            wall_now = time.time()
+            now = int(wall_now)
             try:
+                # Single round-trip: succeeds if the lock is free OR its TTL has
+                # expired, so stealing a dead holder's lock is atomic server-side.
                 self.dynamodb.put_item(
                     TableName=self.table_name,
                     Item={
                         "lock_name": {"S": lock_name},
-                        "lock_id": {"S": self.lock_id},
-                        "acquired_at": {"S": datetime.utcnow().isoformat() + "Z"},
-                        "ttl": {"N": str(ttl_epoch)},
+                        "lock_id": self._lock_id_attr,
+                        "acquired_at": {"S": _utc_timestamp(wall_now)},
+                        "ttl": {"N": str(now + self.ttl_seconds)},
                     },
-                    ConditionExpression="attribute_not_exists(lock_name)",
+                    ConditionExpression="attribute_not_exists(lock_name) OR #ttl < :now",
+                    ExpressionAttributeNames=self._ttl_names,
+                    ExpressionAttributeValues={":now": {"N": str(now)}},
                 )
-                self._held_locks.add(lock_name)
-                self._start_renewal_thread(lock_name)
+                self._cancel_renewal(lock_name)  # Re-acquiring replaces any previous state
+                state = _LockState(acquired_at=time.monotonic())
+                with self._state_lock:
+                    self._locks[lock_name] = state
+                self._schedule_renewal(lock_name, state)
                 logger.info(f"Acquired lock '{lock_name}' with id {self.lock_id}")
                 return True
             except ClientError as e:
                 if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                    # Lock exists, check if expired
-                    if self._try_steal_expired_lock(lock_name, ttl_epoch):
-                        self._held_locks.add(lock_name)
-                        self._start_renewal_thread(lock_name)
-                        logger.info(f"Acquired expired lock '{lock_name}' with id {self.lock_id}")
-                        return True
-                    
+                    # Lock exists and has not expired
                     if not wait:
                         logger.warning(f"Lock '{lock_name}' is held by another process")
                         return False
                     
-                    elapsed = time.time() - start_time
-                    if elapsed >= timeout:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
                         logger.warning(f"Timeout waiting for lock '{lock_name}'")
                         return False
                     
-                    logger.info(f"Lock '{lock_name}' busy, retrying in 5s...")
-                    time.sleep(5)
+                    sleep_for = min(delay, remaining)
+                    logger.info(f"Lock '{lock_name}' busy, retrying in {sleep_for:.2f}s...")
+                    time.sleep(sleep_for)
+                    delay = _next_delay(delay, cap=min(LOCK_RETRY_MAX_DELAY_SECONDS, remaining))
                 else:
                     raise
 
-    def _try_steal_expired_lock(self, lock_name: str, new_ttl: int) -> bool:
-        """Try to steal a lock that has expired TTL.
-        
-        Uses conditional write to atomically check and replace expired lock.
+    @classmethod
+    def _ensure_scheduler(cls) -> sched.scheduler:
+        """Lazily start the single renewal thread shared by every LockManager."""
+        with cls._scheduler_lock:
+            if cls._scheduler is None:
+                wakeup = threading.Event()
+
+                def delay(seconds: float) -> None:
+                    # Sleep until the next renewal is due, but wake early when a
+                    # new (possibly sooner) renewal is scheduled.
+                    if wakeup.wait(timeout=seconds):
+                        wakeup.clear()
+
+                scheduler = sched.scheduler(time.monotonic, delay)
+
+                def run_forever() -> None:
+                    while True:
+                        wakeup.wait()
+                        wakeup.clear()
+                        scheduler.run()
+
+                threading.Thread(target=run_forever, daemon=True, name="lock-renewal").start()
+                cls._scheduler = scheduler
+                cls._scheduler_wakeup = wakeup
+            return cls._scheduler
+
+    def _schedule_renewal(self, lock_name: str, state: _LockState) -> None:
+        """Schedule the next TTL renewal for a lock on the shared renewal thread."""
+        scheduler = self._ensure_scheduler()
+        with self._state_lock:
+            state.renewal = scheduler.enter(
+                self.renewal_interval, 1, self._renew_and_reschedule, (lock_name, state)
+            )
+        self._scheduler_wakeup.set()
+
+    def _renew_and_reschedule(self, lock_name: str, state: _LockState) -> None:
+        """Renew a lock, then queue the next renewal while it is still held.
+
+        Locks that have received heartbeats are only renewed while those
+        heartbeats are recent; a stalled holder lets its lock expire.
         """
         try:
-            # Get current lock
-            response = self.dynamodb.get_item(
-                TableName=self.table_name,
-                Key={"lock_name": {"S": lock_name}},
+            stale_after = self.ttl_seconds * LOCK_HEARTBEAT_STALE_FRACTION
+            if state.last_heartbeat is not None and time.monotonic() - state.last_heartbeat > stale_after:
+                logger.warning(f"Skipping renewal of lock '{lock_name}' - no heartbeat in {stale_after:.0f}s")
+            else:
+                self.renew(lock_name)
+        except Exception as e:
+            logger.error(f"Failed to renew lock '{lock_name}': {e}")
+            # Don't stop - keep trying on the next interval
+        with self._state_lock:
+            # Stop if the lock was released, lost, or re-acquired (new state) meanwhile
+            if self._locks.get(lock_name) is not state or state.renewal is None:
+                return
+            # Already on the scheduler thread, so no wakeup is needed
+            state.renewal = self._scheduler.enter(
+                self.renewal_interval, 1, self._renew_and_reschedule, (lock_name, state)
             )
-            
-            if "Item" not in response:
-                # Lock was released between check and get
-                return False
-            
-            item = response["Item"]
-            current_ttl = int(item.get("ttl", {}).get("N", "0"))
-            current_lock_id = item.get("lock_id", {}).get("S", "")
-            
-            # Only steal if TTL has expired
-            if current_ttl >= int(time.time()):
-                return False
-            
-            # Conditional update - only if lock_id still matches
-            self.dynamodb.put_item(
-                TableName=self.table_name,
-                Item={
-                    "lock_name": {"S": lock_name},
-                    "lock_id": {"S": self.lock_id},
-                    "acquired_at": {"S": datetime.utcnow().isoformat() + "Z"},
-                    "ttl": {"N": str(new_ttl)},
-                },
-                ConditionExpression="lock_id = :old_id",
-                ExpressionAttributeValues={":old_id": {"S": current_lock_id}},
-            )
-            logger.info(f"Stole expired lock '{lock_name}' from {current_lock_id}")
-            return True
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                return False
-            raise
 
-    def _start_renewal_thread(self, lock_name: str) -> None:
-        """Start a background thread to periodically renew the lock TTL."""
-        stop_event = threading.Event()
-        self._stop_events[lock_name] = stop_event
-        
-        def renewal_loop():
-            while not stop_event.wait(timeout=self.renewal_interval):
-                if stop_event.is_set():
-                    break
-                try:
-                    self.renew(lock_name)
-                except Exception as e:
-                    logger.error(f"Failed to renew lock '{lock_name}': {e}")
-                    # Don't break - keep trying
-        
-        thread = threading.Thread(target=renewal_loop, daemon=True, name=f"lock-renewal-{lock_name}")
-        thread.start()
-        self._renewal_threads[lock_name] = thread
-        logger.info(f"Started renewal thread for lock '{lock_name}' (interval={self.renewal_interval}s)")
-
-    def _stop_renewal_thread(self, lock_name: str) -> None:
-        """Stop the background renewal thread for a lock."""
-        if lock_name in self._stop_events:
-            self._stop_events[lock_name].set()
-            del self._stop_events[lock_name]
-        
-        if lock_name in self._renewal_threads:
-            thread = self._renewal_threads[lock_name]
-            thread.join(timeout=5)  # Wait up to 5s for thread to stop
-            del self._renewal_threads[lock_name]
-            logger.info(f"Stopped renewal thread for lock '{lock_name}'")
+    def _cancel_renewal(self, lock_name: str) -> None:
+        """Cancel the pending renewal for a lock. Never blocks on the renewal thread."""
+        with self._state_lock:
+            state = self._locks.get(lock_name)
+            if state is None or state.renewal is None:
+                return
+            event, state.renewal = state.renewal, None
+        try:
+            self._scheduler.cancel(event)
+        except ValueError:
+            pass  # Renewal is running right now; it sees the cleared event and stops
+        logger.info(f"Cancelled renewal for lock '{lock_name}'")
+
+    def heartbeat(self, lock_name: str) -> None:
+        """Record that the holder of a lock is still making progress.
+
+        Once a lock has been heartbeated, background renewal only extends it
+        while heartbeats keep arriving. Locks that are never heartbeated are
+        renewed unconditionally.
+        """
+        state = self._locks.get(lock_name)
+        if state is not None:
+            state.last_heartbeat = time.monotonic()
 
     def renew(self, lock_name: str) -> bool:
         """Renew the TTL on a held lock.
@@ -187,10 +305,11 @@ class LockManager:
         Returns:
             True if renewed, False if we don't hold the lock
         """
-        if lock_name not in self._held_locks:
+        if lock_name not in self._locks:
             return False
         
-        new_ttl = int(time.time()) + self.ttl_seconds
+        now = time.time()
+        new_ttl = int(now) + self.ttl_seconds
         
         try:
             self.dynamodb.update_item(
@@ -198,11 +317,11 @@ class LockManager:
                 Key={"lock_name": {"S": lock_name}},
                 UpdateExpression="SET #ttl = :ttl, renewed_at = :renewed",
                 ConditionExpression="lock_id = :id",
-                ExpressionAttributeNames={"#ttl": "ttl"},
+                ExpressionAttributeNames=self._ttl_names,
                 ExpressionAttributeValues={
                     ":ttl": {"N": str(new_ttl)},
-                    ":renewed": {"S": datetime.utcnow().isoformat() + "Z"},
-                    ":id": {"S": self.lock_id},
+                    ":renewed": {"S": _utc_timestamp(now)},
+                    ":id": self._lock_id_attr,
                 },
             )
             logger.info(f"Renewed lock '{lock_name}' TTL to {new_ttl}")
@@ -210,7 +329,8 @@ class LockManager:
         except ClientError as e:
             if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
                 logger.warning(f"Cannot renew lock '{lock_name}' - no longer held")
-                self._held_locks.discard(lock_name)
+                with self._state_lock:
+                    self._locks.pop(lock_name, None)
                 return False
             raise
 
@@ -218,7 +338,7 @@ class LockManager:
         """Release a lock.
         
         Only releases if we hold it (conditional delete).
-        Stops the background renewal thread.
+        Cancels the scheduled background renewal.
         
         Args:
             lock_name: Name of the lock to release
@@ -226,34 +346,76 @@ class LockManager:
         Returns:
             True if released, False if we didn't hold it
         """
-        # Stop renewal thread first
-        self._stop_renewal_thread(lock_name)
-        
-        if lock_name not in self._held_locks:
+        if lock_name not in self._locks:
             logger.warning(f"Attempted to release lock '{lock_name}' not held by this instance")
             return False
         
+        # Stop renewals first
+        self._cancel_renewal(lock_name)
+        
         try:
             self.dynamodb.delete_item(
                 TableName=self.table_name,
                 Key={"lock_name": {"S": lock_name}},
                 ConditionExpression="lock_id = :id",
-                ExpressionAttributeValues={":id": {"S": self.lock_id}},
+                ExpressionAttributeValues=self._id_expr_val,
             )
-            self._held_locks.discard(lock_name)
+            with self._state_lock:
+                self._locks.pop(lock_name, None)
             logger.info(f"Released lock '{lock_name}'")
             return True
         except ClientError as e:
             if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
                 logger.warning(f"Lock '{lock_name}' was already released or stolen")
-                self._held_locks.discard(lock_name)
+                with self._state_lock:
+                    self._locks.pop(lock_name, None)
                 return False
             raise
 
     def release_all(self) -> None:
-        """Release all locks held by this instance."""
-        for lock_name in list(self._held_locks):
-            self.release(lock_name)
+        """Release all locks held by this instance.
+
+        Multiple locks are deleted in one TransactWriteItems round-trip (chunked
+        at DynamoDB's 100-item limit). If the transaction is cancelled because a
+        lock was already released or stolen, falls back to per-lock release.
+        """
+        with self._state_lock:
+            lock_names = list(self._locks)
+        if len(lock_names) <= 1:
+            for lock_name in lock_names:
+                self.release(lock_name)
+            return
+
+        for lock_name in lock_names:
+            self._cancel_renewal(lock_name)
+
+        for i in range(0, len(lock_names), _TRANSACT_MAX_ITEMS):
+            chunk = lock_names[i : i + _TRANSACT_MAX_ITEMS]
+            try:
+                self.dynamodb.transact_write_items(
+                    TransactItems=[
+                        {
+                            "Delete": {
+                                "TableName": self.table_name,
+                                "Key": {"lock_name": {"S": lock_name}},
+                                "ConditionExpression": "lock_id = :id",
+                                "ExpressionAttributeValues": self._id_expr_val,
+                            }
+                        }
+                        for lock_name in chunk
+                    ]
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "TransactionCanceledException":
+                    raise
+                logger.warning(f"Batch release cancelled ({e}); releasing locks individually")
+                for lock_name in chunk:
+                    self.release(lock_name)
+                continue
+            with self._state_lock:
+                for lock_name in chunk:
+                    self._locks.pop(lock_name, None)
+            logger.info(f"Released locks {chunk}")
 
     def acquire_product_lock(
         self, exchange: str, product_id: str, timeout: int = 0
@@ -292,6 +454,15 @@ class LockManager:
         finally:
             self.ttl_seconds = original_ttl
 
+    def heartbeat_product_lock(self, exchange: str, product_id: str) -> None:
+        """Record progress on a product lock (see ``heartbeat``).
+
+        Args:
+            exchange: Exchange name (e.g., "coinbase")
+            product_id: Product ID (e.g., "BTC-USD")
+        """
+        self.heartbeat(f"product:{exchange}:{product_id}")
+
     def release_product_lock(self, exchange: str, product_id: str) -> bool:
         """Release product-specific lock.
 
@@ -312,6 +483,18 @@ class CheckpointManager:
     Both incremental ingest and full_refresh backfill share the same checkpoint,
     ensuring seamless handoff after backfill completes.
     
+    Saves are coalesced: the latest checkpoint per product is kept in memory and
+    only persisted every ``flush_every_n`` saves or ``min_interval_s`` seconds
+    (the first save for a product always persists). Checkpoints are monotonic
+    cursors, so losing a buffered value on crash only re-fetches a few pages.
+    Call ``flush()``/``flush_all()`` at sync points and ``close()`` at shutdown.
+
+    With ``write_behind=True``, coalesced writes that come due are handed to a
+    background writer thread instead of blocking the caller; the writer also
+    persists anything left buffered for ``min_interval_s`` without a new save. ``force``/``durable``
+    saves and explicit flushes still write synchronously, and writes for the
+    same product are serialized so an older checkpoint can never land last.
+    
     Checkpoint structure:
         {
             "cursor": int,         # Next trade ID cursor (after param for oldest->newest pagination)
@@ -319,37 +502,91 @@ class CheckpointManager:
         }
     """
 
-    def __init__(self, s3_bucket: str, s3_prefix: str, use_s3: bool = True):
+    def __init__(
+        self,
+        s3_bucket: str,
+        s3_prefix: str,
+        use_s3: bool = True,
+        min_interval_s: float = MIN_CHECKPOINT_INTERVAL_SECONDS,
+        flush_every_n: int = CHECKPOINT_FLUSH_EVERY_N,
+        write_behind: bool = False,
+    ):
         """Initialize checkpoint manager.
         
         Args:
             s3_bucket: S3 bucket for checkpoints
             s3_prefix: S3 prefix (without /checkpoints suffix)
             use_s3: Whether to store in S3 (True) or local filesystem (False)
+            min_interval_s: Persist a product's checkpoint at most this often
+            flush_every_n: Persist after this many buffered saves regardless of time
+            write_behind: Persist due checkpoints from a background thread
         """
         self.s3_bucket = s3_bucket
         self.s3_prefix = s3_prefix
         self.use_s3 = use_s3
         self.local_dir = "state"
+        self.min_interval_s = min_interval_s
+        self.flush_every_n = flush_every_n
+        self._pending: dict[str, dict] = {}
+        self._pending_count: dict[str, int] = {}
+        self._last_flush: dict[str, float] = {}
+        self._last_hash: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._write_locks: dict[str, threading.Lock] = {}
+        self.write_behind = write_behind
+        self._due: set[str] = set()
+        self._due_event = threading.Event()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
         if not use_s3:
             os.makedirs(self.local_dir, exist_ok=True)
-        if use_s3:
-            self.s3 = boto3.client("s3")
+
+    @functools.cached_property
+    def s3(self):
+        """S3 client, created on first use so runs that never touch S3 skip the setup."""
+        return _s3_client()
+
+    @property
+    def s3_prefix(self) -> str:
+        return self._s3_prefix
+
+    @s3_prefix.setter
+    def s3_prefix(self, value: str) -> None:
+        # Precompute the key prefix once instead of re-stripping on every call
+        self._s3_prefix = value
+        self._key_prefix = f"{value.rstrip('/')}/checkpoints/"
+
+    @property
+    def local_dir(self) -> str:
+        return self._local_dir
+
+    @local_dir.setter
+    def local_dir(self, value: str) -> None:
+        self._local_dir = value
+        self._path_prefix = os.path.join(value, "")
 
     def _s3_key(self, product_id: str) -> str:
         """Return S3 key for a product checkpoint."""
-        return f"{self.s3_prefix.rstrip('/')}/checkpoints/{product_id}.json"
+        return self._key_prefix + product_id + ".json"
 
     def _local_path(self, product_id: str) -> str:
         """Return local path for a product checkpoint."""
-        return os.path.join(self.local_dir, f"{product_id}.json")
+        return self._path_prefix + product_id + ".json"
 
     def load(self, product_id: str) -> dict:
-        """Load checkpoint for a product (returns empty dict if not found)."""
+        """Load checkpoint for a product (returns empty dict if not found).
+
+        A buffered checkpoint that has not been flushed yet takes precedence.
+        """
+        with self._lock:
+            pending = self._pending.get(product_id)
+        if pending is not None:
+            return dict(pending)
+
         if self.use_s3:
             try:
                 obj = self.s3.get_object(Bucket=self.s3_bucket, Key=self._s3_key(product_id))
-                data = json.loads(obj["Body"].read())
+                data = orjson.loads(obj["Body"].read())
                 logger.info(f"Loaded checkpoint for {product_id}: {data}")
                 return data
             except self.s3.exceptions.ClientError as e:
@@ -362,29 +599,192 @@ class CheckpointManager:
             path = self._local_path(product_id)
             if os.path.exists(path):
                 try:
-                    with open(path, "r") as f:
-                        return json.load(f)
+                    with open(path, "rb") as f:
+                        return orjson.loads(f.read())
                 except Exception:
                     return {}
             return {}
 
-    def save(self, product_id: str, checkpoint: dict) -> None:
-        """Save checkpoint for a product."""
-        checkpoint["last_updated"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    def load_many(self, product_ids: Iterable[str], max_workers: int = 16) -> dict[str, dict]:
+        """Load checkpoints for several products concurrently.
+
+        Each load is an independent GET, so fanning them out over a thread
+        pool costs roughly one round-trip instead of one per product.
+
+        Returns:
+            Dict mapping product_id -> checkpoint (empty dict if not found)
+        """
+        product_ids = list(product_ids)
+        if len(product_ids) <= 1 or not self.use_s3:
+            return {pid: self.load(pid) for pid in product_ids}
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(product_ids)), thread_name_prefix="checkpoint-load"
+        ) as executor:
+            return dict(zip(product_ids, executor.map(self.load, product_ids)))
+
+    def save(self, product_id: str, checkpoint: dict, force: bool = False, durable: bool = False) -> None:
+        """Save checkpoint for a product (buffered; see class docstring).
+
+        Saves that match the last persisted checkpoint (ignoring ``last_updated``)
+        are dropped, so idle products cost no S3 writes.
+
+        Args:
+            product_id: Product identifier
+            checkpoint: Checkpoint dict (``last_updated`` is set here)
+            force: Persist immediately, even if unchanged (e.g. as a heartbeat)
+            durable: Persist immediately and, for local checkpoints, fsync the file
+                and its directory so the write survives a crash
+        """
+        digest = _checkpoint_hash(checkpoint)
+        checkpoint["last_updated"] = _utc_timestamp()
+        with self._lock:
+            if not force and digest == self._last_hash.get(product_id):
+                # Nothing new since the last write; anything buffered is superseded
+                self._pending.pop(product_id, None)
+                self._pending_count.pop(product_id, None)
+                return
+            self._pending[product_id] = checkpoint
+            count = self._pending_count.get(product_id, 0) + 1
+            self._pending_count[product_id] = count
+            last_flush = self._last_flush.get(product_id)
+            due = (
+                force
+                or durable
+                or last_flush is None
+                or count >= self.flush_every_n
+                or time.monotonic() - last_flush >= self.min_interval_s
+            )
+            if due and self.write_behind and not (force or durable or self._stop.is_set()):
+                self._due.add(product_id)
+                self._ensure_writer()
+                self._due_event.set()
+                return
+        if due:
+            self.flush(product_id, durable=durable)
+
+    def _ensure_writer(self) -> None:
+        """Start the write-behind thread if needed (caller holds ``_lock``)."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="checkpoint-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """Drain due products; failed writes stay buffered for the next flush.
+
+        The writer also wakes every ``min_interval_s`` and persists checkpoints
+        that have sat in the buffer that long, so a product that stops saving
+        (rate-limit backoff, a slow upload) still gets its cursor written.
+        """
+        while True:
+            self._due_event.wait(self.min_interval_s or None)
+            if self._stop.is_set():
+                return  # close() flushes whatever is still buffered
+            with self._lock:
+                self._due_event.clear()
+                now = time.monotonic()
+                for product_id in self._pending:
+                    if now - self._last_flush.get(product_id, 0.0) >= self.min_interval_s:
+                        self._due.add(product_id)
+                product_ids = list(self._due)
+                self._due.clear()
+            for product_id in product_ids:
+                try:
+                    self.flush(product_id)
+                except Exception as e:
+                    logger.error(f"Background checkpoint write failed for {product_id}: {e}")
+
+    def flush(self, product_id: str, durable: bool = False) -> None:
+        """Persist the buffered checkpoint for a product, if any (see ``save`` for ``durable``)."""
+        with self._lock:
+            write_lock = self._write_locks.setdefault(product_id, threading.Lock())
+        # Serialize writes per product so a slower, older write cannot land last
+        with write_lock:
+            with self._lock:
+                self._due.discard(product_id)
+                checkpoint = self._pending.pop(product_id, None)
+                self._pending_count.pop(product_id, None)
+                if checkpoint is None:
+                    return
+                self._last_flush[product_id] = time.monotonic()
+            try:
+                self._write(product_id, checkpoint, durable=durable)
+            except Exception:
+                # Keep the value buffered so a later flush can retry it
+                with self._lock:
+                    self._pending.setdefault(product_id, checkpoint)
+                raise
+            with self._lock:
+                self._last_hash[product_id] = _checkpoint_hash(checkpoint)
+
+    def discard(self, product_id: str) -> None:
+        """Drop the buffered checkpoint for a product without writing it.
+
+        Waits for an in-flight write of the product, so nothing is written for it
+        once this returns (until the next ``save``).
+        """
+        with self._lock:
+            write_lock = self._write_locks.setdefault(product_id, threading.Lock())
+        with write_lock:
+            with self._lock:
+                self._due.discard(product_id)
+                self._pending.pop(product_id, None)
+                self._pending_count.pop(product_id, None)
+
+    def close(self) -> None:
+        """Stop the write-behind thread and persist every buffered checkpoint.
+
+        Later saves are written synchronously. Safe to call more than once.
+        """
+        self._stop.set()
+        self._due_event.set()
+        with self._lock:
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+        self.flush_all()
+
+    def flush_all(self) -> None:
+        """Persist every buffered checkpoint."""
+        with self._lock:
+            product_ids = list(self._pending)
+        for product_id in product_ids:
+            try:
+                self.flush(product_id)
+            except Exception as e:
+                logger.error(f"Failed to flush checkpoint for {product_id}: {e}")
+
+    def _write(self, product_id: str, checkpoint: dict, durable: bool = False) -> None:
+        """Write a checkpoint to S3 or the local state dir.
+
+        S3 PUTs are durable once acknowledged, so ``durable`` only affects local writes.
+        """
         if self.use_s3:
             key = self._s3_key(product_id)
             self.s3.put_object(
                 Bucket=self.s3_bucket,
                 Key=key,
-                Body=json.dumps(checkpoint),
+                Body=orjson.dumps(checkpoint),
                 ContentType="application/json",
             )
         else:
             path = self._local_path(product_id)
             tmp_path = path + ".tmp"
-            with open(tmp_path, "w") as f:
-                json.dump(checkpoint, f)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(checkpoint))
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
             os.replace(tmp_path, path)
+            if durable:
+                # Persist the rename itself, not just the file contents
+                dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
 
 
 __all__ = ["CheckpointManager", "LockManager"]
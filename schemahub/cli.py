@@ -7,17 +7,24 @@ from typing import Iterable
 import re
 import sys
 import os
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import logging
 import uuid
 import json
+import math
 
+import orjson
 from dotenv import load_dotenv
 
 from schemahub.connectors.coinbase import CoinbaseConnector
-from schemahub.raw_writer import write_jsonl_s3
+from schemahub.raw_writer import (
+    RAW_COMPRESSION_SUFFIXES,
+    BackgroundUploader,
+    encode_jsonl,
+    put_jsonl_s3,
+    write_jsonl_s3,
+)
 from schemahub.checkpoint import CheckpointManager, LockManager
 from schemahub.transform import transform_raw_to_unified
 from schemahub.validation import validate_batch_and_check_manifest, validate_full_dataset_daily
@@ -28,8 +35,14 @@ from schemahub.parallel import fetch_trades_parallel
 from schemahub.config import (
     DEFAULT_PRODUCT_WORKERS,
     DEFAULT_CHUNK_CONCURRENCY,
+    DEFAULT_RAW_COMPRESSION,
     MIN_CHUNK_CONCURRENCY,
     MAX_CHUNK_CONCURRENCY,
+    RAW_BATCH_MAX_AGE_SECONDS,
+    RAW_BATCH_MAX_TRADES,
+    RAW_OBJECT_TARGET_BYTES,
+    S3_MULTIPART_PART_SIZE_BYTES,
+    S3_UPLOAD_MAX_CONCURRENCY,
 )
 
 # Load .env file if it exists
@@ -60,9 +73,16 @@ def ingest_coinbase(
     target_trade_id: int,
     run_id: str,
     checkpoint_mgr: CheckpointManager | None = None,
-    cache_batch_size: int = 100_000,
+    cache_batch_size: int = RAW_BATCH_MAX_TRADES,
     progress_tracker: ProgressTracker | None = None,
     chunk_concurrency: int = 1,
+    lock_mgr: LockManager | None = None,
+    s3_part_size: int = S3_MULTIPART_PART_SIZE_BYTES,
+    s3_upload_concurrency: int = S3_UPLOAD_MAX_CONCURRENCY,
+    connector: CoinbaseConnector | None = None,
+    compression: str = DEFAULT_RAW_COMPRESSION,
+    max_batch_bytes: int = RAW_OBJECT_TARGET_BYTES,
+    max_batch_age_s: float = RAW_BATCH_MAX_AGE_SECONDS,
 ) -> dict:
     """Ingest trades from oldest to newest using monotonic trade ID pagination.
 
@@ -86,12 +106,23 @@ def ingest_coinbase(
         checkpoint_mgr: Optional checkpoint manager for saving progress
         cache_batch_size: Number of trades to cache before writing to S3 (default 100K)
         chunk_concurrency: Number of parallel chunks (default 1 = sequential, >1 = parallel)
+        lock_mgr: Optional lock manager holding this product's lock; heartbeated as batches progress
+        s3_part_size: Multipart part size in bytes for large raw objects
+        s3_upload_concurrency: Parallel part uploads per raw object
+        connector: Optional shared connector; one is created if not provided
+        compression: Raw object codec ("none" or "gzip"; gzip keys end in .jsonl.gz)
+        max_batch_bytes: Sequential mode also flushes once the encoded batch reaches this size
+        max_batch_age_s: Sequential mode also flushes a batch this many seconds after its first page
 
     Returns:
         Dict with keys: records_written, final_cursor, checkpoint_ts
     """
-    connector = CoinbaseConnector()
+    connector = connector or CoinbaseConnector()
+    # Bound once: the record conversion runs per trade inside the encode loops
+    to_raw_record = connector.to_raw_record
     ingest_ts = datetime.now(timezone.utc)
+    key_base = f"{prefix.rstrip('/')}/raw_coinbase_trades_{product_id}_{ingest_ts:%Y%m%dT%H%M%SZ}_{run_id}"
+    key_suffix = ".jsonl" + RAW_COMPRESSION_SUFFIXES[compression]
 
     logger.info(
         f"Starting ingest for {product_id}: cursor={cursor}, target={target_trade_id}, "
@@ -105,55 +136,71 @@ def ingest_coinbase(
         total_records = 0
         current_cursor = cursor
 
-        try:
-            while current_cursor < target_trade_id:
-                # Calculate chunk end - fetch up to cache_batch_size trades at a time
-                # Each API call returns `limit` trades, so chunk covers cache_batch_size trades
-                chunk_end = min(current_cursor + cache_batch_size, target_trade_id)
-
-                logger.info(f"[{product_id}] Parallel chunk: cursor [{current_cursor:,}, {chunk_end:,})")
-
-                # Fetch this chunk in parallel
-                chunk_trades, chunk_highest = fetch_trades_parallel(
-                    connector=connector,
-                    product_id=product_id,
-                    cursor_start=current_cursor,
-                    cursor_end=chunk_end,
-                    chunk_concurrency=chunk_concurrency,
-                )
-
-                if not chunk_trades:
-                    logger.info(f"[{product_id}] No trades in chunk, moving to next")
-                    current_cursor = chunk_end
-                    continue
+        def upload_chunk(chunk_trades: list, chunk_highest: int) -> None:
+            """Encode, upload and checkpoint one chunk (runs on the uploader thread)."""
+            nonlocal total_records
+            # Convert to records lazily while writing to S3
+            cached_records = (to_raw_record(t, product_id, ingest_ts) for t in chunk_trades)
+
+            first_trade_id = chunk_trades[0].trade_id
+            last_trade_id = chunk_trades[-1].trade_id
+            key = f"{key_base}_{first_trade_id}_{last_trade_id}_{len(chunk_trades)}{key_suffix}"
+
+            logger.info(f"[{product_id}] Writing {len(chunk_trades):,} trades to s3://{bucket}/{key}")
+            write_jsonl_s3(
+                cached_records,
+                bucket=bucket,
+                key=key,
+                part_size=s3_part_size,
+                max_concurrency=s3_upload_concurrency,
+                compression=compression,
+            )
+            total_records += len(chunk_trades)
 
-                # Convert to records and write to S3
-                cached_records = [connector.to_raw_record(t, product_id, ingest_ts) for t in chunk_trades]
+            # Save checkpoint after each flush
+            if checkpoint_mgr:
+                checkpoint_mgr.save(product_id, {"cursor": chunk_highest})
+                logger.info(f"[{product_id}] Checkpoint saved: cursor={chunk_highest:,}")
 
-                first_trade_id = chunk_trades[0].trade_id
-                last_trade_id = chunk_trades[-1].trade_id
-                key = f"{prefix.rstrip('/')}/raw_coinbase_trades_{product_id}_{ingest_ts:%Y%m%dT%H%M%SZ}_{run_id}_{first_trade_id}_{last_trade_id}_{len(chunk_trades)}.jsonl"
+            # Update progress tracker
+            if progress_tracker:
+                progress_tracker.update_progress(product_id, len(chunk_trades), chunk_highest)
+                progress_tracker.print_progress(force=True)
 
-                logger.info(f"[{product_id}] Writing {len(chunk_trades):,} trades to s3://{bucket}/{key}")
-                write_jsonl_s3(cached_records, bucket=bucket, key=key)
-                total_records += len(chunk_trades)
+            print(f"  {product_id}: wrote {len(chunk_trades):,} trades (cursor={chunk_highest:,}, target={target_trade_id:,}, total={total_records:,})")
 
-                # Save checkpoint after each flush
-                if checkpoint_mgr:
-                    checkpoint_mgr.save(product_id, {"cursor": chunk_highest})
-                    logger.info(f"[{product_id}] Checkpoint saved: cursor={chunk_highest:,}")
+        try:
+            # The next chunk is fetched while the previous one uploads
+            with BackgroundUploader(f"raw-upload-{product_id}") as uploader:
+                while current_cursor < target_trade_id:
+                    # Calculate chunk end - fetch up to cache_batch_size trades at a time
+                    # Each API call returns `limit` trades, so chunk covers cache_batch_size trades
+                    chunk_end = min(current_cursor + cache_batch_size, target_trade_id)
+
+                    logger.info(f"[{product_id}] Parallel chunk: cursor [{current_cursor:,}, {chunk_end:,})")
+
+                    # Fetch this chunk in parallel
+                    chunk_trades, chunk_highest = fetch_trades_parallel(
+                        connector=connector,
+                        product_id=product_id,
+                        cursor_start=current_cursor,
+                        cursor_end=chunk_end,
+                        chunk_concurrency=chunk_concurrency,
+                    )
+                    if lock_mgr:
+                        lock_mgr.heartbeat_product_lock("coinbase", product_id)
 
-                # Update progress tracker
-                if progress_tracker:
-                    progress_tracker.update_progress(product_id, len(chunk_trades), chunk_highest)
-                    progress_tracker.print_progress(force=True)
+                    if not chunk_trades:
+                        logger.info(f"[{product_id}] No trades in chunk, moving to next")
+                        current_cursor = chunk_end
+                        continue
 
-                print(f"  {product_id}: wrote {len(chunk_trades):,} trades (cursor={chunk_highest:,}, target={target_trade_id:,}, total={total_records:,})")
+                    uploader.submit(upload_chunk, chunk_trades, chunk_highest)
 
-                # Move cursor forward for next chunk
-                # Use chunk_end (pre-calculated boundary) not chunk_highest (API response)
-                # This ensures we advance by the full chunk size, not by what the API returned
-                current_cursor = chunk_end
+                    # Move cursor forward for next chunk
+                    # Use chunk_end (pre-calculated boundary) not chunk_highest (API response)
+                    # This ensures we advance by the full chunk size, not by what the API returned
+                    current_cursor = chunk_end
 
             logger.info(f"[{product_id}] Parallel ingest complete: {total_records:,} total trades")
             return {
@@ -171,107 +218,124 @@ def ingest_coinbase(
     logger.info(f"Ingest time (UTC): {ingest_ts.isoformat()}")
     
     total_records = 0
-    cached_trades = []
-    cached_records = []
     current_cursor = cursor
     highest_trade_seen = 0
-    
-    while True:
-        logger.info(f"[{product_id}] Fetching trades: after={current_cursor}, limit={limit}")
-        
-        try:
-            # Fetch trades with ID < current_cursor
-            trades, _ = connector.fetch_trades_with_cursor(
-                product_id=product_id,
-                limit=limit,
-                after=current_cursor,
-            )
-            logger.info(f"[{product_id}] Got {len(trades)} trades from API")
-        except Exception as e:
-            logger.error(f"[{product_id}] API request failed: {e}", exc_info=True)
-            raise
-        
-        if not trades:
-            logger.info(f"[{product_id}] No more trades (empty response)")
-            break
-        
-        # Trades are returned in descending order (newest first)
-        # trades[0] has highest ID, trades[-1] has lowest ID
-        batch_highest = trades[0].trade_id
-        batch_lowest = trades[-1].trade_id
-        
-        # Check for duplicate fetch (no progress made)
-        if batch_highest <= highest_trade_seen:
-            logger.info(f"[{product_id}] No new trades (batch_highest={batch_highest} <= already_seen={highest_trade_seen})")
-            break
-        
-        highest_trade_seen = max(highest_trade_seen, batch_highest)
-        
-        # Cache trades and raw records
-        cached_trades.extend(trades)
-        cached_records.extend([connector.to_raw_record(t, product_id, ingest_ts) for t in trades])
-        
-        # Move cursor forward based on highest trade seen
-        current_cursor = highest_trade_seen + limit + 1
-        
-        # Write to S3 and checkpoint when cache reaches threshold
-        if len(cached_trades) >= cache_batch_size:
-            # Sort cached trades by trade_id for consistent ordering in file
-            cached_trades_sorted = sorted(cached_trades, key=lambda t: t.trade_id)
-            cached_records_sorted = [connector.to_raw_record(t, product_id, ingest_ts) for t in cached_trades_sorted]
-            
-            first_trade_id = cached_trades_sorted[0].trade_id
-            last_trade_id = cached_trades_sorted[-1].trade_id
-            key = f"{prefix.rstrip('/')}/raw_coinbase_trades_{product_id}_{ingest_ts:%Y%m%dT%H%M%SZ}_{run_id}_{first_trade_id}_{last_trade_id}_{len(cached_trades)}.jsonl"
-            
-            logger.info(f"[{product_id}] Writing batch: {len(cached_trades)} trades to s3://{bucket}/{key}")
-            write_jsonl_s3(cached_records_sorted, bucket=bucket, key=key)
-            total_records += len(cached_trades)
-
-            # Save checkpoint
-            if checkpoint_mgr:
-                checkpoint_mgr.save(product_id, {"cursor": highest_trade_seen})
-                logger.info(f"[{product_id}] Checkpoint saved: cursor={highest_trade_seen}")
-
-            # Update progress tracker
-            if progress_tracker:
-                progress_tracker.update_progress(product_id, len(cached_trades), highest_trade_seen)
-                progress_tracker.print_progress(force=True)  # Print on every batch write
-
-            print(f"  {product_id}: wrote {len(cached_trades)} trades (cursor={highest_trade_seen}, target={target_trade_id})")
-            cached_trades = []
-            cached_records = []
-        
-        # Stop if we've fetched up to and including the target
-        if batch_highest >= target_trade_id:
-            logger.info(f"[{product_id}] Reached target (batch_highest={batch_highest} >= target={target_trade_id})")
-            break
-    
-    # Write remaining trades
-    if cached_trades:
-        # Sort for consistent ordering
-        cached_trades_sorted = sorted(cached_trades, key=lambda t: t.trade_id)
-        cached_records_sorted = [connector.to_raw_record(t, product_id, ingest_ts) for t in cached_trades_sorted]
-        
-        first_trade_id = cached_trades_sorted[0].trade_id
-        last_trade_id = cached_trades_sorted[-1].trade_id
-        key = f"{prefix.rstrip('/')}/raw_coinbase_trades_{product_id}_{ingest_ts:%Y%m%dT%H%M%SZ}_{run_id}_{first_trade_id}_{last_trade_id}_{len(cached_trades)}.jsonl"
-        
-        logger.info(f"[{product_id}] Writing final batch: {len(cached_trades)} trades to s3://{bucket}/{key}")
-        write_jsonl_s3(cached_records_sorted, bucket=bucket, key=key)
-        total_records += len(cached_trades)
 
-        # Save checkpoint
+    # Pages are encoded to JSONL as they arrive; only the bytes are buffered.
+    # Each entry is (lowest trade_id in page, encoded page) so the batch can be
+    # written in trade_id order. A batch is flushed to one S3 object when it
+    # reaches cache_batch_size trades or max_batch_bytes.
+    page_blobs: list[tuple[int, bytearray]] = []
+    batch_trades = 0
+    batch_bytes = 0
+    batch_first_id = 0
+    batch_last_id = 0
+    batch_started = 0.0
+
+    def upload_batch(payload: bytes, key: str, n_trades: int, n_bytes: int, batch_cursor: int) -> None:
+        """Upload and checkpoint one batch (runs on the uploader thread)."""
+        nonlocal total_records
+        logger.info(f"[{product_id}] Writing batch: {n_trades} trades ({n_bytes:,} bytes) to s3://{bucket}/{key}")
+        put_jsonl_s3(
+            payload,
+            bucket=bucket,
+            key=key,
+            part_size=s3_part_size,
+            max_concurrency=s3_upload_concurrency,
+            compression=compression,
+        )
+        total_records += n_trades
+
+        # Checkpoint only after the batch is durable in S3, so a crash never
+        # advances the cursor past data that was not written
         if checkpoint_mgr:
-            checkpoint_mgr.save(product_id, {"cursor": highest_trade_seen})
-            logger.info(f"[{product_id}] Checkpoint saved: cursor={highest_trade_seen}")
+            checkpoint_mgr.save(product_id, {"cursor": batch_cursor})
+            logger.info(f"[{product_id}] Checkpoint saved: cursor={batch_cursor}")
 
-        # Update progress tracker
         if progress_tracker:
-            progress_tracker.update_progress(product_id, len(cached_trades), highest_trade_seen)
+            progress_tracker.update_progress(product_id, n_trades, batch_cursor)
+            progress_tracker.print_progress(force=True)  # Print on every batch write
+
+        print(f"  {product_id}: wrote {n_trades} trades (cursor={batch_cursor}, target={target_trade_id})")
+
+    def write_batch(uploader: BackgroundUploader) -> None:
+        """Hand the buffered batch to the uploader and start a new one."""
+        nonlocal page_blobs, batch_trades, batch_bytes
+        page_blobs.sort(key=lambda page: page[0])
+        payload = b"".join(blob for _, blob in page_blobs)
+        key = f"{key_base}_{batch_first_id}_{batch_last_id}_{batch_trades}{key_suffix}"
+        uploader.submit(upload_batch, payload, key, batch_trades, batch_bytes, highest_trade_seen)
+        page_blobs = []
+        batch_trades = 0
+        batch_bytes = 0
+
+    # The next pages are fetched while the previous batch uploads
+    with BackgroundUploader(f"raw-upload-{product_id}") as uploader:
+        while True:
+            logger.info(f"[{product_id}] Fetching trades: after={current_cursor}, limit={limit}")
+
+            try:
+                # Fetch trades with ID < current_cursor
+                trades, _ = connector.fetch_trades_with_cursor(
+                    product_id=product_id,
+                    limit=limit,
+                    after=current_cursor,
+                )
+                logger.info(f"[{product_id}] Got {len(trades)} trades from API")
+                if lock_mgr:
+                    lock_mgr.heartbeat_product_lock("coinbase", product_id)
+            except Exception as e:
+                logger.error(f"[{product_id}] API request failed: {e}", exc_info=True)
+                raise
+
+            if not trades:
+                logger.info(f"[{product_id}] No more trades (empty response)")
+                break
+
+            # Trades are returned in descending order (newest first)
+            # trades[0] has highest ID, trades[-1] has lowest ID
+            batch_highest = trades[0].trade_id
+
+            # Check for duplicate fetch (no progress made)
+            if batch_highest <= highest_trade_seen:
+                logger.info(f"[{product_id}] No new trades (batch_highest={batch_highest} <= already_seen={highest_trade_seen})")
+                break
+
+            highest_trade_seen = max(highest_trade_seen, batch_highest)
+
+            # Encode the page in trade_id order and add it to the batch. The page
+            # is already descending, so walk it backwards instead of sorting a copy
+            blob = encode_jsonl(to_raw_record(t, product_id, ingest_ts) for t in reversed(trades))
+            page_low, page_high = trades[-1].trade_id, batch_highest
+            if not page_blobs:
+                batch_started = time.monotonic()
+            batch_first_id = page_low if not page_blobs else min(batch_first_id, page_low)
+            batch_last_id = page_high if not page_blobs else max(batch_last_id, page_high)
+            page_blobs.append((page_low, blob))
+            batch_trades += len(trades)
+            batch_bytes += len(blob)
+
+            # Move cursor forward based on highest trade seen
+            current_cursor = highest_trade_seen + limit + 1
+
+            # Upload and checkpoint when the batch reaches a size threshold, or has been
+            # open long enough that a slow (throttled) fetch would delay the checkpoint
+            if (
+                batch_trades >= cache_batch_size
+                or batch_bytes >= max_batch_bytes
+                or time.monotonic() - batch_started >= max_batch_age_s
+            ):
+                write_batch(uploader)
+
+            # Stop if we've fetched up to and including the target
+            if batch_highest >= target_trade_id:
+                logger.info(f"[{product_id}] Reached target (batch_highest={batch_highest} >= target={target_trade_id})")
+                break
+
+        # Write remaining trades
+        if page_blobs:
+            write_batch(uploader)
 
-        print(f"  {product_id}: wrote {len(cached_trades)} trades (cursor={highest_trade_seen}, target={target_trade_id})")
-    
     checkpoint_ts = datetime.now(timezone.utc).isoformat() + "Z"
     logger.info(f"[{product_id}] Ingest complete: {total_records} total records, final_cursor={current_cursor}")
     
@@ -282,6 +346,66 @@ def ingest_coinbase(
     }
 
 
+MIB = 1024 * 1024
+
+
+def _positive_int(value: str) -> int:
+    """argparse type: an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def _mib(value: str) -> int:
+    """argparse type: a positive size in MiB -> bytes."""
+    mib = int(value)
+    if mib < 1:
+        raise argparse.ArgumentTypeError("size must be at least 1 MiB")
+    return mib * MIB
+
+
+def _part_size_mib(value: str) -> int:
+    """argparse type: part size in MiB -> bytes, enforcing S3's 5 MiB part minimum."""
+    mib = int(value)
+    if mib < 5:
+        raise argparse.ArgumentTypeError("S3 multipart parts must be at least 5 MiB")
+    return mib * MIB
+
+
+def _regex(value: str) -> re.Pattern[str]:
+    """argparse type: compile a regex once, reporting bad patterns as usage errors."""
+    try:
+        return re.compile(value)
+    except re.error as exc:
+        raise argparse.ArgumentTypeError(f"invalid regex {value!r}: {exc}") from exc
+
+
+def _has_non_finite(value) -> bool:
+    """Return True if ``value`` holds a NaN or infinite float at any depth."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def _print_summary(summary: dict) -> None:
+    """Write a run summary to stdout as one JSON line.
+
+    orjson would write NaN/Infinity metrics as ``null``, so summaries holding
+    them go through ``json.dumps`` and keep its ``NaN``/``Infinity`` tokens.
+    """
+    sys.stdout.flush()  # Keep ordering with earlier print() output
+    if _has_non_finite(summary):
+        print(json.dumps(summary), flush=True)
+        return
+    sys.stdout.buffer.write(orjson.dumps(summary, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS))
+    sys.stdout.buffer.flush()
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="SchemaHub CLI (Coinbase-only MVP)")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -305,13 +429,53 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_CHUNK_CONCURRENCY,
         help=f"Number of parallel chunks per product (default {DEFAULT_CHUNK_CONCURRENCY}, use 1 to disable within-product parallelism)"
     )
+    ingest_parser.add_argument(
+        "--s3-part-size-mib",
+        dest="s3_part_size",
+        type=_part_size_mib,
+        default=S3_MULTIPART_PART_SIZE_BYTES,
+        help=f"Multipart part size in MiB for large raw objects (default {S3_MULTIPART_PART_SIZE_BYTES // MIB}, minimum 5)",
+    )
+    ingest_parser.add_argument(
+        "--s3-upload-concurrency",
+        type=_positive_int,
+        default=S3_UPLOAD_MAX_CONCURRENCY,
+        help=f"Parallel part uploads per raw object (default {S3_UPLOAD_MAX_CONCURRENCY})",
+    )
+    ingest_parser.add_argument(
+        "--flush-rows",
+        dest="cache_batch_size",
+        type=_positive_int,
+        default=RAW_BATCH_MAX_TRADES,
+        help=f"Trades per raw object before flushing to S3 (default {RAW_BATCH_MAX_TRADES:,})",
+    )
+    ingest_parser.add_argument(
+        "--flush-mib",
+        dest="max_batch_bytes",
+        type=_mib,
+        default=RAW_OBJECT_TARGET_BYTES,
+        help=f"Also flush a sequential batch once it reaches this many MiB (default {RAW_OBJECT_TARGET_BYTES // MIB})",
+    )
+    ingest_parser.add_argument(
+        "--flush-seconds",
+        dest="max_batch_age_s",
+        type=_positive_int,
+        default=RAW_BATCH_MAX_AGE_SECONDS,
+        help=f"Also flush a sequential batch this many seconds after its first page (default {RAW_BATCH_MAX_AGE_SECONDS})",
+    )
+    ingest_parser.add_argument(
+        "--compression",
+        choices=sorted(RAW_COMPRESSION_SUFFIXES),
+        default=DEFAULT_RAW_COMPRESSION,
+        help=f"Compress raw JSONL objects before upload (default {DEFAULT_RAW_COMPRESSION})",
+    )
     ingest_parser.add_argument("--dry-run", action="store_true", help="Show what would be ingested, do not fetch")
 
     # Simple update-seed command (barebones)
     upd = subparsers.add_parser("update-seed", help="Fetch product ids from Coinbase and update seed file")
     upd.add_argument("--path", default=None, help="Path to seed YAML (default config/mappings/product_ids_seed.yaml)")
     upd.add_argument("--merge", action="store_true", help="Merge fetched ids with existing seed file instead of replacing")
-    upd.add_argument("--filter-regex", default=None, help="Only keep product ids matching this regex, e.g. '.*-USD'")
+    upd.add_argument("--filter-regex", type=_regex, default=None, help="Only keep product ids matching this regex, e.g. '.*-USD'")
     upd.add_argument("--dry-run", action="store_true", help="Print what would be written but do not write file")
 
     # Transform command
@@ -353,16 +517,20 @@ def main(argv: Iterable[str] | None = None) -> None:
 
     if args.command == "ingest":
         s3_bucket = get_s3_bucket(args)
-        connector = CoinbaseConnector()
+        # One connector (and HTTP connection pool) shared by every product and
+        # fetch thread in this run
+        connector = CoinbaseConnector(pool_maxsize=max(10, args.workers * args.chunk_concurrency))
         
         # Acquire distributed lock (if configured)
         lock_mgr = get_lock_manager()
         if lock_mgr and not args.dry_run:
+            lock_mgr.warmup()
             if not lock_mgr.acquire("ingest", wait=False):
                 logger.error("Could not acquire ingest lock - another ingest job is running")
                 print("Error: Another ingest job is currently running. Exiting.", file=sys.stderr)
                 sys.exit(3)
         
+        checkpoint_mgr = None
         try:
             # Determine products to run
             products_to_run = []
@@ -390,8 +558,17 @@ def main(argv: Iterable[str] | None = None) -> None:
                 s3_bucket=s3_bucket,
                 s3_prefix=args.s3_prefix,
                 use_s3=args.checkpoint_s3,
+                # Due checkpoint PUTs run in the background instead of stalling the
+                # next fetch; product release still flushes synchronously
+                write_behind=True,
             )
 
+            # Prefetch checkpoints for all products in one concurrent round instead of
+            # one GET per product. Safe because the job-level ingest lock is held.
+            checkpoints: dict[str, dict] = {}
+            if not args.full_refresh:
+                checkpoints = checkpoint_mgr.load_many(products_to_run)
+
             # Progress tracker - only for full-refresh backfills
             progress_tracker = None
             if args.full_refresh and not args.dry_run:
@@ -402,11 +579,13 @@ def main(argv: Iterable[str] | None = None) -> None:
                 print(f"\nScanning {len(products_to_run)} products to calculate total records to process...")
                 scan_start = time.time()
                 scanned_count = 0
+                scanned_work: dict[str, int] = {}
                 for pid in products_to_run:
                     try:
                         target_trade_id = connector.get_latest_trade_id(pid)
                         cursor = 1000  # Full refresh always starts from 1000
                         progress_tracker.add_product(pid, cursor, target_trade_id)
+                        scanned_work[pid] = target_trade_id - cursor
                         scanned_count += 1
                         if scanned_count % 10 == 0:  # Progress update every 10 products
                             print(f"  Scanned {scanned_count}/{len(products_to_run)} products...")
@@ -417,6 +596,13 @@ def main(argv: Iterable[str] | None = None) -> None:
                 scan_elapsed = time.time() - scan_start
                 print(f"Scan complete in {scan_elapsed:.1f} seconds. Starting backfill...\n")
 
+                # Start the longest backfills first so a few large products are not
+                # left running alone at the end while the other workers sit idle
+                products_to_run = sorted(products_to_run, key=lambda pid: scanned_work.get(pid, 0), reverse=True)
+            elif checkpoints:
+                # Incremental: cold starts (no checkpoint yet) carry the most work
+                products_to_run = sorted(products_to_run, key=lambda pid: bool(checkpoints.get(pid)))
+
             total_records = 0
             run_status = "success"
 
@@ -434,12 +620,20 @@ def main(argv: Iterable[str] | None = None) -> None:
                     return {"product": pid, "status": "skipped", "reason": "locked_by_another_worker"}
 
                 try:
-                    return _process_product_impl(pid)
+                    return _process_product_impl(pid, lock_mgr)
                 finally:
+                    # Persist any coalesced checkpoint before another worker can take the product
+                    try:
+                        checkpoint_mgr.flush(pid)
+                    except Exception as e:
+                        # Drop it rather than write it after the lock is gone; the next run
+                        # resumes from the last persisted cursor (transform dedupes the overlap)
+                        logger.error(f"[{pid}] Failed to flush checkpoint before releasing lock: {e}")
+                        checkpoint_mgr.discard(pid)
                     lock_mgr.release_product_lock("coinbase", pid)
                     logger.info(f"[{pid}] Released product lock")
 
-            def _process_product_impl(pid: str) -> dict:
+            def _process_product_impl(pid: str, lock_mgr: LockManager | None = None) -> dict:
                 """Implementation of product processing (separated for lock handling)."""
                 nonlocal total_records
 
@@ -456,7 +650,9 @@ def main(argv: Iterable[str] | None = None) -> None:
                     cursor = 1000  # Start from beginning
                     logger.info(f"[{pid}] Full refresh: starting from cursor=1000")
                 else:
-                    ckpt = checkpoint_mgr.load(pid)
+                    ckpt = checkpoints.get(pid)
+                    if ckpt is None:
+                        ckpt = checkpoint_mgr.load(pid)
                     cursor = ckpt.get("cursor", 1000)  # Default to 1000 if no checkpoint (cold start)
                     if cursor == 1000 and not ckpt:
                         logger.info(f"[{pid}] No checkpoint found, cold start from cursor=1000")
@@ -489,6 +685,14 @@ def main(argv: Iterable[str] | None = None) -> None:
                         checkpoint_mgr=checkpoint_mgr,
                         progress_tracker=progress_tracker,
                         chunk_concurrency=args.chunk_concurrency,
+                        lock_mgr=lock_mgr,
+                        s3_part_size=args.s3_part_size,
+                        s3_upload_concurrency=args.s3_upload_concurrency,
+                        connector=connector,
+                        compression=args.compression,
+                        cache_batch_size=args.cache_batch_size,
+                        max_batch_bytes=args.max_batch_bytes,
+                        max_batch_age_s=args.max_batch_age_s,
                     )
                     
                     records_written = result["records_written"]
@@ -540,7 +744,7 @@ def main(argv: Iterable[str] | None = None) -> None:
                 "full_refresh": args.full_refresh,
                 "checkpoint_ts": datetime.now(timezone.utc).isoformat() + "Z",
             }
-            print(json.dumps(summary), flush=True)
+            _print_summary(summary)
             
             # Publish overall ingest metrics
             if not args.dry_run:
@@ -557,6 +761,9 @@ def main(argv: Iterable[str] | None = None) -> None:
                 flush_metrics()
         
         finally:
+            # Last checkpoint I/O of the run: it must land while the ingest lock is held
+            if checkpoint_mgr is not None:
+                checkpoint_mgr.close()
             # Release distributed lock
             if lock_mgr and not args.dry_run:
                 lock_mgr.release("ingest")
@@ -566,29 +773,30 @@ def main(argv: Iterable[str] | None = None) -> None:
         connector = CoinbaseConnector()
         try:
             logger.info("Fetching products from Coinbase API")
-            resp = requests.get("https://api.exchange.coinbase.com/products", timeout=10)
-            resp.raise_for_status()
-            products = resp.json()
+            products = connector.fetch_products(timeout=10)
             logger.info(f"Fetched {len(products)} products from Coinbase")
         except Exception as exc:  # noqa: BLE001 - keep simple
             logger.error(f"Failed to fetch products from Coinbase: {exc}", exc_info=True)
             print(f"Failed to fetch products from Coinbase: {exc}", file=sys.stderr)
             sys.exit(2)
 
-        ids = sorted({p.get("id") for p in products if p.get("id")})
-        logger.info(f"Extracted {len(ids)} product IDs")
+        # Dedupe, filter and merge as a set; the seed file is sorted once at the end
+        id_set = {p["id"] for p in products if p.get("id")}
+        logger.info(f"Extracted {len(id_set)} product IDs")
 
         if args.filter_regex:
-            logger.info(f"Filtering by regex: {args.filter_regex}")
-            rx = re.compile(args.filter_regex)
-            ids = [i for i in ids if rx.search(i)]
-            logger.info(f"After filter: {len(ids)} product IDs")
+            # Compiled by argparse, so an invalid pattern fails before the API call
+            logger.info(f"Filtering by regex: {args.filter_regex.pattern}")
+            id_set = set(filter(args.filter_regex.search, id_set))
+            logger.info(f"After filter: {len(id_set)} product IDs")
 
         if args.merge:
             logger.info("Merging with existing seed file")
             existing, _meta = connector.load_product_seed(args.path)
-            ids = sorted(set(existing) | set(ids))
-            logger.info(f"After merge: {len(ids)} product IDs")
+            id_set.update(existing)
+            logger.info(f"After merge: {len(id_set)} product IDs")
+
+        ids = sorted(id_set)
 
         if args.dry_run:
             logger.info(f"[DRY-RUN] Would write {len(ids)} product IDs")
@@ -601,10 +809,9 @@ def main(argv: Iterable[str] | None = None) -> None:
 
         logger.info(f"Saving {len(ids)} product IDs to seed file")
         metadata = {"source": "coinbase", "count": len(ids)}
-        connector.save_product_seed(ids, path=args.path, metadata=metadata)
-        saved, meta = connector.load_product_seed(args.path)
-        logger.info(f"Successfully wrote {len(saved)} product IDs")
-        print(f"Wrote {len(saved)} product ids to {args.path or 'DEFAULT'}")
+        written = connector.save_product_seed(ids, path=args.path, metadata=metadata)
+        logger.info(f"Successfully wrote {written} product IDs")
+        print(f"Wrote {written} product ids to {args.path or 'DEFAULT'}")
 
     if args.command == "transform":
         logger.info("Starting transform command")
@@ -613,6 +820,7 @@ def main(argv: Iterable[str] | None = None) -> None:
         # Acquire distributed lock (if configured)
         lock_mgr = get_lock_manager()
         if lock_mgr:
+            lock_mgr.warmup()
             if not lock_mgr.acquire("transform", wait=False):
                 logger.error("Could not acquire transform lock - another transform job is running")
                 print("Error: Another transform job is currently running. Exiting.", file=sys.stderr)
@@ -724,7 +932,7 @@ def main(argv: Iterable[str] | None = None) -> None:
             if args.full_scan:
                 summary["validation_issues"] = validation_issues
                 summary["validation_metrics"] = validation_metrics
-            print(json.dumps(summary), flush=True)
+            _print_summary(summary)
         
         finally:
             # Release distributed lock
@@ -740,11 +948,24 @@ if __name__ == "__main__":
     if '-v' in sys.argv or '--verbose' in sys.argv:
         log_level = logging.DEBUG
     
+    # Worker threads only enqueue records; a single listener thread does the
+    # stderr writes, so logging never serializes the ingest workers on I/O
+    import logging.handlers
+    import queue
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, stderr_handler)
+
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format='%(message)s',  # Full format is applied once, by stderr_handler
         handlers=[
-            logging.StreamHandler(sys.stderr),
+            logging.handlers.QueueHandler(log_queue),
         ]
     )
-    main()
+    log_listener.start()
+    try:
+        main()
+    finally:
+        log_listener.stop()  # Drains queued records before exit
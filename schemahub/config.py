@@ -5,7 +5,9 @@ This module defines all configuration constants for:
 - Product-level parallelism (worker threads)
 - Within-product parallelism (chunk workers)
 - Lock management (DynamoDB TTLs)
+- AWS client retries
 - Checkpoint batching
+- Raw object sizing, compression and S3 uploads
 """
 
 # ===== Rate Limiting =====
@@ -13,6 +15,8 @@ This module defines all configuration constants for:
 COINBASE_RATE_LIMIT_PUBLIC = 8.0  # req/sec (unauthenticated API, limit is 10)
 COINBASE_RATE_LIMIT_AUTHENTICATED = 8.0  # req/sec (with API keys)
 RATE_LIMITER_BURST_MULTIPLIER = 1.5  # Allow 1.5x burst (12 tokens) - reduced to avoid spikes
+API_RETRY_BASE_DELAY_SECONDS = 1.0  # Backoff ceiling for the first 429/5xx retry
+API_RETRY_MAX_DELAY_SECONDS = 30.0  # Cap for jittered exponential API backoff
 
 # Auto-detect rate limit based on API key presence
 def get_coinbase_rate_limit() -> float:
@@ -53,11 +57,40 @@ MAX_TOTAL_THREADS = MAX_PRODUCT_WORKERS * MAX_CHUNK_CONCURRENCY  # 200
 PRODUCT_LOCK_TTL_SECONDS = 7200  # 2 hours
 PRODUCT_LOCK_RENEWAL_INTERVAL = 1800  # 30 minutes (renew lock every 30 min)
 JOB_LOCK_TTL_SECONDS = 14400  # 4 hours (longer for multi-product jobs)
+LOCK_RETRY_BASE_DELAY_SECONDS = 0.1  # First retry delay when a lock is busy
+LOCK_RETRY_MAX_DELAY_SECONDS = 5.0  # Cap for decorrelated-jitter retry delay
+LOCK_HEARTBEAT_STALE_FRACTION = 0.9  # Skip renewal if no heartbeat within this fraction of the TTL
+
+
+# ===== AWS Clients =====
+# botocore "adaptive" mode adds client-side rate limiting on top of standard
+# retries, absorbing DynamoDB/S3 throttling during lock renewals and checkpoint saves
+AWS_RETRY_MODE = "adaptive"
+AWS_MAX_ATTEMPTS = 10  # Total attempts, including the first request
 
 
 # ===== Checkpoint Batching =====
 CHECKPOINT_BATCH_SIZE = 5000  # Update checkpoint every N trades
-MIN_CHECKPOINT_INTERVAL_SECONDS = 60  # Minimum time between checkpoint writes
+MIN_CHECKPOINT_INTERVAL_SECONDS = 5  # Minimum time between persisted checkpoint writes per product
+CHECKPOINT_FLUSH_EVERY_N = 100  # Persist after this many buffered saves regardless of time
+
+
+# ===== Raw Object Sizing & S3 Uploads =====
+# Sequential ingest flushes a batch to one S3 object at this size (or at
+# RAW_BATCH_MAX_TRADES trades, whichever comes first). Large objects amortize
+# per-PUT latency; this cap bounds the memory held per product worker.
+RAW_OBJECT_TARGET_BYTES = 64 * 1024 * 1024  # 64 MiB
+RAW_BATCH_MAX_TRADES = 100_000  # Trades per raw object (also the parallel chunk span)
+RAW_BATCH_MAX_AGE_SECONDS = 30  # Flush a sequential batch this long after its first page
+
+# Payloads at or above the threshold are uploaded as concurrent multipart parts
+S3_MULTIPART_THRESHOLD_BYTES = 16 * 1024 * 1024  # 16 MiB
+S3_MULTIPART_PART_SIZE_BYTES = 8 * 1024 * 1024  # 8 MiB (S3 minimum is 5 MiB)
+S3_UPLOAD_MAX_CONCURRENCY = 8  # Parallel part uploads per object
+
+# Raw JSONL compression ("none" or "gzip"); gzip objects get a .jsonl.gz key
+DEFAULT_RAW_COMPRESSION = "none"
+RAW_GZIP_LEVEL = 6  # zlib level: most of level 9's ratio at a fraction of the CPU
 
 
 # ===== Metrics Configuration =====
@@ -84,6 +117,8 @@ __all__ = [
     "COINBASE_RATE_LIMIT_PUBLIC",
     "COINBASE_RATE_LIMIT_AUTHENTICATED",
     "RATE_LIMITER_BURST_MULTIPLIER",
+    "API_RETRY_BASE_DELAY_SECONDS",
+    "API_RETRY_MAX_DELAY_SECONDS",
     "get_coinbase_rate_limit",
 
     # Product-level parallelism
@@ -105,10 +140,28 @@ __all__ = [
     "PRODUCT_LOCK_TTL_SECONDS",
     "PRODUCT_LOCK_RENEWAL_INTERVAL",
     "JOB_LOCK_TTL_SECONDS",
+    "LOCK_RETRY_BASE_DELAY_SECONDS",
+    "LOCK_RETRY_MAX_DELAY_SECONDS",
+    "LOCK_HEARTBEAT_STALE_FRACTION",
+
+    # AWS clients
+    "AWS_RETRY_MODE",
+    "AWS_MAX_ATTEMPTS",
 
     # Checkpoint batching
     "CHECKPOINT_BATCH_SIZE",
     "MIN_CHECKPOINT_INTERVAL_SECONDS",
+    "CHECKPOINT_FLUSH_EVERY_N",
+
+    # Raw object sizing & S3 uploads
+    "RAW_OBJECT_TARGET_BYTES",
+    "RAW_BATCH_MAX_TRADES",
+    "RAW_BATCH_MAX_AGE_SECONDS",
+    "S3_MULTIPART_THRESHOLD_BYTES",
+    "S3_MULTIPART_PART_SIZE_BYTES",
+    "S3_UPLOAD_MAX_CONCURRENCY",
+    "DEFAULT_RAW_COMPRESSION",
+    "RAW_GZIP_LEVEL",
 
     # Performance constants
     "COINBASE_API_LATENCY_P50_MS",
@@ -2,20 +2,24 @@
 from __future__ import annotations
 
 import base64
+import functools
 import hashlib
 import hmac
-import json
 import os
 import logging
+import random
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Iterable, List, Optional, Tuple, Iterable as _Iterable
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 import yaml
 
+from schemahub.config import API_RETRY_BASE_DELAY_SECONDS, API_RETRY_MAX_DELAY_SECONDS
 from schemahub.health import get_circuit_breaker
 from schemahub.metrics import get_metrics_client
 from schemahub.rate_limiter import get_rate_limiter
@@ -35,6 +39,17 @@ DEFAULT_SEED_PATH = os.path.join(
 # Load environment variables from .env file
 load_dotenv()
 
+# libyaml's C loader/dumper when available (much faster than the pure-Python ones)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_seed_file(path: str, mtime_ns: int, size: int, inode: int) -> dict:
+    """Parse a seed file; cached on its stat signature so rewrites are picked up."""
+    with open(path, "r", encoding="utf-8") as fh:
+        return yaml.load(fh, Loader=_YAML_LOADER) or {}
+
 
 @dataclass
 class CoinbaseTrade:
@@ -64,8 +79,26 @@ class CoinbaseTrade:
 class CoinbaseConnector:
     """Fetches trades from the Coinbase public REST API."""
 
-    def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self.session = session or requests.Session()
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_maxsize: Optional[int] = None,
+    ) -> None:
+        """Create a connector.
+
+        Args:
+            session: Optional pre-configured session (used as-is)
+            pool_maxsize: Connection pool size for an internally created session.
+                Size this to the number of threads sharing the connector so
+                concurrent fetches reuse keep-alive connections instead of
+                opening and discarding new ones.
+        """
+        if session is None:
+            session = requests.Session()
+            if pool_maxsize:
+                adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+                session.mount("https://", adapter)
+        self.session = session
         self.session.headers.update({
             "User-Agent": "schemahub/0.1",
         })
@@ -105,7 +138,8 @@ class CoinbaseConnector:
     ) -> Tuple[List[CoinbaseTrade], Optional[int]]:
         """Fetch trades and return the cursor from CB-AFTER header for next pagination.
 
-        Includes retry logic with flat 2s backoff for failures.
+        Retries 429s and 5xx responses with jittered exponential backoff
+        (see :func:`_retry_delay`).
 
         Args:
             timeout: Read timeout in seconds (default: 15). Increase if getting timeout errors.
@@ -143,15 +177,18 @@ class CoinbaseConnector:
             try:
                 # Acquire rate limit token before making API request
                 rate_limiter = get_rate_limiter("coinbase")
-                logger.debug(f"[API] {product_id}: Acquiring rate limit token (attempt {attempt}/{max_retries})")
+                logger.debug("[API] %s: Acquiring rate limit token (attempt %d/%d)", product_id, attempt, max_retries)
                 rate_limiter.acquire()  # Blocks if rate limit reached
-                logger.debug(f"[API] {product_id}: Rate limit token acquired")
+                logger.debug("[API] %s: Rate limit token acquired", product_id)
 
                 logger.info(f"[API] {product_id}: Attempt {attempt}/{max_retries}, timeout={timeout}s")
                 response = self.session.get(url, params=params, timeout=timeout)
                 elapsed_ms = (time.time() - start_time) * 1000
                 logger.info(f"[API] {product_id}: Response received in {elapsed_ms:.0f}ms, status={response.status_code}")
-                logger.debug(f"[API] {product_id}: Response headers: Content-Length={response.headers.get('Content-Length')}, Content-Type={response.headers.get('Content-Type')}")
+                logger.debug(
+                    "[API] %s: Response headers: Content-Length=%s, Content-Type=%s",
+                    product_id, response.headers.get("Content-Length"), response.headers.get("Content-Type"),
+                )
 
                 # Check status FIRST before recording success
                 response.raise_for_status()
@@ -227,8 +264,9 @@ class CoinbaseConnector:
                         logger.error(f"[API] {product_id}: RATE LIMITED! (HTTP 429)")
                         metrics.put_rate_limit_error("coinbase")
                         if attempt < max_retries:
-                            logger.error(f"[API] {product_id}: Backing off 2s before retry (attempt {attempt+1}/{max_retries})")
-                            time.sleep(2)  # Flat 2s backoff
+                            delay = _retry_delay(attempt, error_response)
+                            logger.error(f"[API] {product_id}: Backing off {delay:.1f}s before retry (attempt {attempt+1}/{max_retries})")
+                            time.sleep(delay)
                             continue
                         else:
                             logger.error(f"[API] {product_id}: FAILED after {max_retries} attempts (rate limit)")
@@ -238,8 +276,9 @@ class CoinbaseConnector:
                         logger.error(f"[API] {product_id}: *** SERVER ERROR 5XX DETECTED *** status={status_code}")
                         metrics.put_server_error("coinbase")
                         if attempt < max_retries:
-                            logger.error(f"[API] {product_id}: Backing off 2s before retry (attempt {attempt+1}/{max_retries})")
-                            time.sleep(2)  # Flat 2s backoff
+                            delay = _retry_delay(attempt, error_response)
+                            logger.error(f"[API] {product_id}: Backing off {delay:.1f}s before retry (attempt {attempt+1}/{max_retries})")
+                            time.sleep(delay)
                             continue
                         else:
                             logger.error(f"[API] {product_id}: FAILED after {max_retries} attempts (server error)")
@@ -268,14 +307,14 @@ class CoinbaseConnector:
             parse_start = time.time()
             payloads: List[dict] = response.json()
             parse_elapsed = time.time() - parse_start
-            logger.debug(f"[API] {product_id}: Parsed {len(payloads)} trades in {parse_elapsed:.3f}s")
+            logger.debug("[API] %s: Parsed %d trades in %.3fs", product_id, len(payloads), parse_elapsed)
         except Exception as e:
             logger.error(f"[API] {product_id}: Failed to parse JSON response: {e}")
             logger.debug(f"[API] {product_id}: Response text (first 500 chars): {response.text[:500]}")
             raise
         
         trades = [CoinbaseTrade.from_payload(payload) for payload in payloads]
-        logger.debug(f"[API] {product_id}: Created {len(trades)} CoinbaseTrade objects")
+        logger.debug("[API] %s: Created %d CoinbaseTrade objects", product_id, len(trades))
         
         # Get the next cursor from the CB-AFTER header if it exists
         next_cursor = response.headers.get("CB-AFTER")
@@ -325,6 +364,27 @@ class CoinbaseConnector:
         logger.info(f"[API] {product_id}: Latest trade_id = {latest_trade_id}")
         return latest_trade_id
 
+    def fetch_products(self, timeout: int = 10) -> List[dict]:
+        """Fetch the Coinbase product catalogue.
+
+        Uses the connector's pooled session, so the request shares keep-alive
+        connections with the rest of the run.
+
+        Args:
+            timeout: Request timeout in seconds
+
+        Returns:
+            List of product payloads as returned by ``GET /products``
+
+        Raises:
+            requests.RequestException: If API call fails
+        """
+        url = f"{COINBASE_API_URL}/products"
+        logger.info(f"[API] GET {url}")
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
     @staticmethod
     def load_product_seed(path: Optional[str] = None) -> Tuple[List[str], dict]:
         """Load product ids and metadata from a YAML seed file.
@@ -338,36 +398,42 @@ class CoinbaseConnector:
             return [], {}
         
         logger.info(f"Loading product seed from {path}")
-        with open(path, "r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh) or {}
-        product_ids = data.get("product_ids") or []
-        metadata = data.get("metadata") or {}
+        st = os.stat(path)
+        data = _read_seed_file(os.path.abspath(path), st.st_mtime_ns, st.st_size, st.st_ino)
+        # Copies, so callers cannot mutate the cached parse
+        product_ids = list(data.get("product_ids") or [])
+        metadata = dict(data.get("metadata") or {})
         logger.info(f"Loaded {len(product_ids)} products from seed file")
         return product_ids, metadata
 
     @staticmethod
-    def save_product_seed(product_ids: _Iterable[str], path: Optional[str] = None, metadata: Optional[dict] = None) -> None:
+    def save_product_seed(product_ids: _Iterable[str], path: Optional[str] = None, metadata: Optional[dict] = None) -> int:
         """Save product ids and optional metadata to a YAML seed file.
 
         This will create parent directories if necessary and write atomically
         by writing to a temporary file then renaming.
+
+        Returns:
+            Number of product ids written
         """
         path = path or DEFAULT_SEED_PATH
         parent = os.path.dirname(path)
         os.makedirs(parent, exist_ok=True)
-        logger.info(f"Saving {len(list(product_ids))} product IDs to {path}")
+        product_ids = list(product_ids)  # Materialize once; may be a generator
+        logger.info(f"Saving {len(product_ids)} product IDs to {path}")
         
         payload = {
-            "product_ids": list(product_ids),
+            "product_ids": product_ids,
             "metadata": dict(metadata or {}),
         }
         payload["metadata"].setdefault("last_updated", datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"))
 
         tmp_path = path + ".tmp"
         with open(tmp_path, "w", encoding="utf-8") as fh:
-            yaml.safe_dump(payload, fh, sort_keys=False)
+            yaml.dump(payload, fh, Dumper=_YAML_DUMPER, sort_keys=False)
         os.replace(tmp_path, path)
         logger.info(f"Successfully saved seed file to {path}")
+        return len(product_ids)
 
     @staticmethod
     def to_raw_record(
@@ -385,16 +451,39 @@ class CoinbaseConnector:
             "side": trade.side.upper(),
             "_source": "coinbase",
             "_source_ingest_ts": ingest_ts,
-            "_raw_payload": json.dumps(trade.__dict__),
+            # orjson: this per-trade dump dominated to_raw_record under stdlib json
+            "_raw_payload": orjson.dumps(trade.__dict__).decode(),
         }
 
 
+def _retry_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """Return how long to wait before retrying a throttled or failed request.
+
+    A numeric ``Retry-After`` header wins. Otherwise the delay is drawn from the
+    upper half of an exponentially growing window, so threads that were
+    throttled together spread out instead of retrying in lock-step.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(API_RETRY_MAX_DELAY_SECONDS, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form; fall back to computed backoff
+    window = min(API_RETRY_MAX_DELAY_SECONDS, API_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(window / 2, window)
+
+
 def _parse_time(value: str) -> datetime:
     """Parse an ISO8601 timestamp returned by Coinbase."""
 
-    normalized = value.replace("Z", "+00:00")
-    parsed = datetime.fromisoformat(normalized)
-    if parsed.tzinfo is None:
+    # Python 3.11+ parses the trailing "Z" natively and hands back the
+    # timezone.utc singleton, so the common case needs no conversion.
+    parsed = datetime.fromisoformat(value)
+    tzinfo = parsed.tzinfo
+    if tzinfo is timezone.utc:
+        return parsed
+    if tzinfo is None:
         return parsed.replace(tzinfo=timezone.utc)
     return parsed.astimezone(timezone.utc)
 
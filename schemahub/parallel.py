@@ -112,23 +112,21 @@ def fetch_trades_parallel(
                 )
 
                 if trades:
+                    # Scan the page before taking the lock shared by every chunk thread
+                    batch_highest = max(t.trade_id for t in trades)
                     with results_lock:
                         all_trades.extend(trades)
-                        batch_highest = max(t.trade_id for t in trades)
                         highest_trade_id = max(highest_trade_id, batch_highest)
                         pages_completed += 1
 
                     logger.debug(
-                        f"[PARALLEL] {product_id}: cursor={cursor_target:,} "
-                        f"fetched {len(trades)} trades (page {pages_completed}/{num_pages})"
+                        "[PARALLEL] %s: cursor=%d fetched %d trades (page %d/%d)",
+                        product_id, cursor_target, len(trades), pages_completed, num_pages,
                     )
                 else:
                     with results_lock:
                         pages_completed += 1
-                    logger.debug(
-                        f"[PARALLEL] {product_id}: cursor={cursor_target:,} "
-                        f"returned 0 trades"
-                    )
+                    logger.debug("[PARALLEL] %s: cursor=%d returned 0 trades", product_id, cursor_target)
 
             except Exception as e:
                 # Permanent failure - all retries exhausted in fetch_trades_with_cursor
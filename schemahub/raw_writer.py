@@ -1,21 +1,68 @@
 """Utilities for writing raw records to S3."""
 from __future__ import annotations
 
-import json
+import functools
+import gzip
+import io
 import os
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Iterable, Mapping
+from typing import Callable, Iterable, Mapping
 
 import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
 from botocore.client import BaseClient
+from botocore.config import Config
 from dotenv import load_dotenv
 
+from schemahub.config import (
+    AWS_MAX_ATTEMPTS,
+    AWS_RETRY_MODE,
+    RAW_GZIP_LEVEL,
+    S3_MULTIPART_PART_SIZE_BYTES,
+    S3_MULTIPART_THRESHOLD_BYTES,
+    S3_UPLOAD_MAX_CONCURRENCY,
+)
+
 logger = logging.getLogger(__name__)
 
+# S3 rejects multipart uploads with more than this many parts
+S3_MAX_PARTS = 10_000
+
+# Supported raw compression codecs -> suffix appended to the ".jsonl" key
+RAW_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz"}
+
 # Load environment variables from .env file
 load_dotenv()
 
+# boto3's default session is not thread-safe for client creation, and each
+# product's uploader thread may ask for the shared client at the same time
+_client_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_s3_client(max_pool_connections: int) -> BaseClient:
+    """Return the process-wide upload client for a given pool size.
+
+    Reusing one client keeps its keep-alive connections warm across batches
+    instead of paying client setup and a fresh TLS handshake per upload.
+    """
+    with _client_lock:
+        return boto3.client(
+            "s3",
+            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+            region_name=os.getenv("AWS_REGION", "us-east-1"),
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                retries={"mode": AWS_RETRY_MODE, "total_max_attempts": AWS_MAX_ATTEMPTS},
+            ),
+        )
+
 
 def _default_serializer(value):
     if isinstance(value, datetime):
@@ -23,25 +70,140 @@ def _default_serializer(value):
     raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
-def write_jsonl_s3(records: Iterable[Mapping], bucket: str, key: str, s3_client: BaseClient | None = None) -> None:
-    """Write records to an S3 object in JSON Lines format."""
-    
-    logger.debug(f"Preparing to write records to s3://{bucket}/{key}")
-
-    client = s3_client or boto3.client(
-        "s3",
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        region_name=os.getenv("AWS_REGION", "us-east-1"),
-    )
-    
-    payload = "".join(json.dumps(record, default=_default_serializer) + "\n" for record in records)
-    payload_size = len(payload.encode("utf-8"))
-    logger.debug(f"Payload size: {payload_size} bytes")
-    
+_JSONL_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NAIVE_UTC
+
+
+def encode_jsonl(records: Iterable[Mapping]) -> bytearray:
+    """Encode records as UTF-8 JSON Lines.
+
+    Lines are produced by orjson (compact separators, datetimes as ISO 8601,
+    naive datetimes treated as UTC) and appended straight into one growing
+    buffer, so ``records`` can be a lazy generator and no intermediate str
+    payload is built.
+    """
+    payload = bytearray()
+    dumps = orjson.dumps
+    for record in records:
+        payload += dumps(record, default=_default_serializer, option=_JSONL_OPTIONS)
+    return payload
+
+
+def compress_jsonl(payload: bytes, compression: str = "none") -> bytes:
+    """Compress an encoded JSON Lines payload with the given codec.
+
+    gzip output uses ``mtime=0`` so identical payloads produce identical objects.
+    """
+    if compression == "none":
+        return payload
+    if compression == "gzip":
+        return gzip.compress(payload, compresslevel=RAW_GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported raw compression: {compression!r}")
+
+
+def put_jsonl_s3(
+    payload: bytes,
+    bucket: str,
+    key: str,
+    s3_client: BaseClient | None = None,
+    multipart_threshold: int = S3_MULTIPART_THRESHOLD_BYTES,
+    part_size: int = S3_MULTIPART_PART_SIZE_BYTES,
+    max_concurrency: int = S3_UPLOAD_MAX_CONCURRENCY,
+    compression: str = "none",
+) -> None:
+    """Upload an already-encoded JSON Lines payload to S3.
+
+    Payloads of at least ``multipart_threshold`` bytes go through a multipart
+    upload whose parts are sent concurrently, so a large batch is not limited
+    to a single PUT stream. Smaller payloads use one ``put_object``. Part size is
+    raised automatically if the payload would exceed S3's 10,000-part limit.
+
+    ``compression`` is applied before upload (see :func:`compress_jsonl`); the
+    caller is responsible for the matching key suffix in
+    ``RAW_COMPRESSION_SUFFIXES``.
+    """
+
+    # At least one pooled connection per concurrent part upload
+    client = s3_client or _default_s3_client(max(10, max_concurrency))
+
+    if compression != "none":
+        raw_size = len(payload)
+        payload = compress_jsonl(payload, compression)
+        logger.debug("Compressed %d -> %d bytes (%s)", raw_size, len(payload), compression)
+
+    payload_size = len(payload)
+    logger.debug("Payload size: %d bytes", payload_size)
+
     try:
-        client.put_object(Bucket=bucket, Key=key, Body=payload.encode("utf-8"))
+        if payload_size >= multipart_threshold:
+            transfer_config = TransferConfig(
+                multipart_threshold=multipart_threshold,
+                multipart_chunksize=max(part_size, -(-payload_size // S3_MAX_PARTS)),
+                max_concurrency=max_concurrency,
+                use_threads=True,
+            )
+            client.upload_fileobj(io.BytesIO(payload), bucket, key, Config=transfer_config)
+        else:
+            client.put_object(Bucket=bucket, Key=key, Body=payload)
         logger.info(f"Successfully wrote {payload_size} bytes to s3://{bucket}/{key}")
     except Exception as e:
         logger.error(f"Failed to write to s3://{bucket}/{key}: {e}", exc_info=True)
         raise
+
+
+def write_jsonl_s3(
+    records: Iterable[Mapping],
+    bucket: str,
+    key: str,
+    s3_client: BaseClient | None = None,
+    **upload_options,
+) -> None:
+    """Write records to an S3 object in JSON Lines format.
+
+    ``records`` is consumed once, so a generator avoids materializing a list.
+    ``upload_options`` are passed through to :func:`put_jsonl_s3`.
+    """
+    
+    logger.debug("Preparing to write records to s3://%s/%s", bucket, key)
+    put_jsonl_s3(encode_jsonl(records), bucket=bucket, key=key, s3_client=s3_client, **upload_options)
+
+
+class BackgroundUploader:
+    """Run raw-object uploads on one background thread, one at a time.
+
+    ``submit`` first waits for the previous upload, so the caller can fetch the
+    next batch while the current one uploads, at most two batches are held in
+    memory, and submitted work (upload, then checkpoint) completes in order.
+    A failed upload is re-raised from the next ``submit`` or ``wait``.
+
+    Used as a context manager, exit waits for the in-flight upload; on a clean
+    exit its error (if any) is raised.
+    """
+
+    def __init__(self, name: str = "raw-upload") -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._pending: Future | None = None
+
+    def submit(self, fn: Callable[..., object], *args, **kwargs) -> None:
+        """Queue ``fn(*args, **kwargs)`` after the previous upload finishes."""
+        self.wait()
+        self._pending = self._executor.submit(fn, *args, **kwargs)
+
+    def wait(self) -> None:
+        """Block until the in-flight upload finishes, re-raising its error."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.result()
+
+    def close(self) -> None:
+        """Let the in-flight upload finish and stop the thread."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BackgroundUploader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self.close()
@@ -1,6 +1,7 @@
 """Transform JSONL raw trades to unified Parquet format."""
 from __future__ import annotations
 
+import gzip
 import logging
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -20,6 +21,17 @@ logger = logging.getLogger(__name__)
 PARALLEL_FETCH_SIZE = 5   # Fetch 5 files concurrently (reduced from 10 for memory)
 BATCH_SIZE = 500_000      # Write every 500K records (reduced from 1M for memory)
 
+# Raw objects are plain JSONL or gzip-compressed JSONL (ingest --compression gzip)
+RAW_KEY_SUFFIXES = (".jsonl", ".jsonl.gz")
+
+
+def _read_raw_body(response: dict, key: str) -> str:
+    """Read a raw object's body as text, decompressing .gz objects."""
+    body = response["Body"].read()
+    if key.endswith(".gz"):
+        body = gzip.decompress(body)
+    return body.decode("utf-8")
+
 
 def load_mapping(mapping_path: str) -> dict:
     """Load transformation mapping from YAML file.
@@ -60,7 +72,7 @@ def list_raw_files_from_s3(bucket: str, prefix: str) -> list[str]:
                 
             for obj in page["Contents"]:
                 key = obj["Key"]
-                if key.endswith(".jsonl"):
+                if key.endswith(RAW_KEY_SUFFIXES):
                     file_keys.append(key)
     
     except Exception as e:
@@ -83,7 +95,7 @@ def fetch_file_content(s3_client, bucket: str, key: str) -> tuple[str, list[dict
     """
     logger.info(f"Fetching s3://{bucket}/{key}")
     response = s3_client.get_object(Bucket=bucket, Key=key)
-    body = response["Body"].read().decode("utf-8")
+    body = _read_raw_body(response, key)
     trades = [json.loads(line) for line in body.strip().split("\n") if line.strip()]
     return key, trades
 
@@ -150,7 +162,7 @@ def iter_raw_files_from_s3(bucket: str, prefix: str, skip_files: list[str] | Non
                 
             for obj in page["Contents"]:
                 key = obj["Key"]
-                if not key.endswith(".jsonl"):
+                if not key.endswith(RAW_KEY_SUFFIXES):
                     continue
                 
                 # Skip already processed files
@@ -160,7 +172,7 @@ def iter_raw_files_from_s3(bucket: str, prefix: str, skip_files: list[str] | Non
                 
                 logger.info(f"Reading raw trades from s3://{bucket}/{key}")
                 response = s3.get_object(Bucket=bucket, Key=key)
-                body = response["Body"].read().decode("utf-8")
+                body = _read_raw_body(response, key)
                 
                 # Parse trades from this file only
                 file_trades = []
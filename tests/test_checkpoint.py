@@ -1,15 +1,20 @@
 """Unit tests for CheckpointManager."""
+import gc
 import json
 import os
 import tempfile
+import threading
+import time
+import weakref
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import boto3
 import pytest
-from botocore.stub import Stubber
+from botocore.stub import ANY, Stubber
 
-from schemahub.checkpoint import CheckpointManager
+from schemahub.checkpoint import CheckpointManager, LockManager, _LockState, _next_delay
+from schemahub.config import LOCK_RETRY_BASE_DELAY_SECONDS
 
 
 class TestCheckpointManagerLocal:
@@ -133,6 +138,50 @@ class TestCheckpointManagerS3:
         
         assert key == "data/trades/checkpoints/BTC-USD.json"
 
+    def test_managers_share_s3_client(self):
+        """CheckpointManagers reuse one cached S3 client instead of building their own."""
+        mgr1 = CheckpointManager(s3_bucket="my-bucket", s3_prefix="data", use_s3=True)
+        mgr2 = CheckpointManager(s3_bucket="other-bucket", s3_prefix="data", use_s3=True)
+
+        assert mgr1.s3 is mgr2.s3
+
+    def test_s3_client_is_created_on_first_use(self):
+        """Constructing a manager does not build an S3 client until one is needed."""
+        with patch("schemahub.checkpoint._s3_client") as mock_client:
+            mgr = CheckpointManager(s3_bucket="my-bucket", s3_prefix="data", use_s3=True)
+            mock_client.assert_not_called()
+
+            mgr.s3
+            mgr.s3
+            mock_client.assert_called_once()
+
+    def test_s3_client_uses_adaptive_retries(self):
+        """The shared S3 client retries throttles in adaptive mode."""
+        mgr = CheckpointManager(s3_bucket="my-bucket", s3_prefix="data", use_s3=True)
+
+        retries = mgr.s3.meta.config.retries
+        assert retries["mode"] == "adaptive"
+        assert retries["total_max_attempts"] == 10
+
+    def test_load_many_from_s3(self):
+        """load_many returns one checkpoint per product, empty for missing keys."""
+        client = boto3.client("s3", region_name="us-east-1")
+        mgr = CheckpointManager(s3_bucket="my-bucket", s3_prefix="data", use_s3=True)
+        mgr.s3 = client
+
+        def fake_get_object(Bucket, Key):
+            if Key.endswith("ETH-USD.json"):
+                raise client.exceptions.ClientError(
+                    {"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject"
+                )
+            return {"Body": MagicMock(read=lambda: json.dumps({"cursor": 42}).encode())}
+
+        with patch.object(client, "get_object", side_effect=fake_get_object) as mock_get:
+            result = mgr.load_many(["BTC-USD", "ETH-USD", "SOL-USD"])
+
+        assert result == {"BTC-USD": {"cursor": 42}, "ETH-USD": {}, "SOL-USD": {"cursor": 42}}
+        assert mock_get.call_count == 3
+
     def test_save_to_s3(self):
         """Saving a checkpoint to S3 works correctly."""
         client = boto3.client("s3", region_name="us-east-1")
@@ -231,3 +280,500 @@ class TestCheckpointManagerS3:
             # Verify timestamp was added to the original checkpoint dict
             assert "last_updated" in checkpoint
             assert checkpoint["last_updated"].endswith("Z")
+
+
+class TestCheckpointManagerCoalescing:
+    """Tests for coalesced checkpoint saves."""
+
+    def _mgr(self, tmpdir, **kwargs):
+        mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, **kwargs)
+        mgr.local_dir = tmpdir
+        return mgr
+
+    def test_saves_within_interval_are_buffered(self):
+        """Only the first save in the interval hits storage; later ones are buffered."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = self._mgr(tmpdir, min_interval_s=3600, flush_every_n=100)
+
+            with patch.object(mgr, "_write", wraps=mgr._write) as mock_write:
+                mgr.save("BTC-USD", {"cursor": 1})
+                mgr.save("BTC-USD", {"cursor": 2})
+                mgr.save("BTC-USD", {"cursor": 3})
+
+            assert mock_write.call_count == 1
+            assert mgr.load("BTC-USD")["cursor"] == 3  # Buffered value wins
+            mgr.flush_all()
+
+    def test_flush_persists_latest_buffered_checkpoint(self):
+        """flush() writes the most recent buffered checkpoint."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = self._mgr(tmpdir, min_interval_s=3600)
+            mgr.save("BTC-USD", {"cursor": 1})
+            mgr.save("BTC-USD", {"cursor": 2})
+
+            mgr.flush("BTC-USD")
+
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 2
+
+    def test_flush_every_n_forces_write(self):
+        """Reaching flush_every_n buffered saves persists even inside the interval."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = self._mgr(tmpdir, min_interval_s=3600, flush_every_n=2)
+
+            with patch.object(mgr, "_write", wraps=mgr._write) as mock_write:
+                mgr.save("BTC-USD", {"cursor": 1})  # First save always persists
+                mgr.save("BTC-USD", {"cursor": 2})  # Buffered (1 pending)
+                mgr.save("BTC-USD", {"cursor": 3})  # 2 pending -> flush
+
+            assert mock_write.call_count == 2
+            assert mock_write.call_args[0][1]["cursor"] == 3
+
+    def test_flush_all_persists_every_product(self):
+        """flush_all() writes buffered checkpoints for all products."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = self._mgr(tmpdir, min_interval_s=3600)
+            for pid in ("BTC-USD", "ETH-USD"):
+                mgr.save(pid, {"cursor": 1})
+                mgr.save(pid, {"cursor": 2})
+
+            mgr.flush_all()
+
+            fresh = self._mgr(tmpdir)
+            assert fresh.load("BTC-USD")["cursor"] == 2
+            assert fresh.load("ETH-USD")["cursor"] == 2
+
+    def test_discard_drops_buffered_checkpoint(self):
+        """discard() removes the buffered value so no later flush writes it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = self._mgr(tmpdir, min_interval_s=3600)
+            mgr.save("BTC-USD", {"cursor": 1})
+            mgr.save("BTC-USD", {"cursor": 2})
+
+            mgr.discard("BTC-USD")
+            mgr.flush_all()
+
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 1
+
+    def test_manager_is_not_kept_alive_by_exit_hooks(self):
+        """Creating a manager registers no process-wide hook that pins it in memory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ref = weakref.ref(self._mgr(tmpdir))
+            gc.collect()
+
+            assert ref() is None
+
+
+class TestCheckpointManagerSkipUnchanged:
+    """Tests for skipping writes of unchanged checkpoints."""
+
+    def test_unchanged_checkpoint_is_not_rewritten(self):
+        """Re-saving the same cursor skips the write even once the interval elapsed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, min_interval_s=0)
+            mgr.local_dir = tmpdir
+
+            with patch.object(mgr, "_write", wraps=mgr._write) as mock_write:
+                mgr.save("BTC-USD", {"cursor": 1})
+                mgr.save("BTC-USD", {"cursor": 1})
+                mgr.save("BTC-USD", {"cursor": 2})
+
+            assert mock_write.call_count == 2
+
+    def test_force_writes_unchanged_checkpoint(self):
+        """force=True persists immediately even when nothing changed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, min_interval_s=3600)
+            mgr.local_dir = tmpdir
+
+            with patch.object(mgr, "_write", wraps=mgr._write) as mock_write:
+                mgr.save("BTC-USD", {"cursor": 1})
+                mgr.save("BTC-USD", {"cursor": 1}, force=True)
+
+            assert mock_write.call_count == 2
+
+
+class TestCheckpointManagerDurable:
+    """Tests for durable local checkpoint writes."""
+
+    def test_durable_save_fsyncs_file_and_directory(self):
+        """durable=True writes immediately and fsyncs both the file and its directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, min_interval_s=3600)
+            mgr.local_dir = tmpdir
+            mgr.save("BTC-USD", {"cursor": 1})
+
+            with patch("schemahub.checkpoint.os.fsync") as mock_fsync:
+                mgr.save("BTC-USD", {"cursor": 2}, durable=True)
+
+            assert mock_fsync.call_count == 2
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 2
+
+    def test_default_save_does_not_fsync(self):
+        """Regular saves stay at page-cache speed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False)
+            mgr.local_dir = tmpdir
+
+            with patch("schemahub.checkpoint.os.fsync") as mock_fsync:
+                mgr.save("BTC-USD", {"cursor": 1})
+
+            mock_fsync.assert_not_called()
+
+
+class TestCheckpointManagerWriteBehind:
+    """Tests for background (write-behind) checkpoint persistence."""
+
+    def test_due_save_is_written_off_the_calling_thread(self):
+        """A due save returns immediately and the writer thread persists it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, write_behind=True)
+            mgr.local_dir = tmpdir
+            written = threading.Event()
+            writer_threads = []
+            real_write = mgr._write
+
+            def tracking_write(*args, **kwargs):
+                writer_threads.append(threading.current_thread().name)
+                real_write(*args, **kwargs)
+                written.set()
+
+            with patch.object(mgr, "_write", side_effect=tracking_write):
+                mgr.save("BTC-USD", {"cursor": 1})
+                assert written.wait(timeout=2)
+
+            mgr.close()
+            assert writer_threads == ["checkpoint-writer"]
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 1
+
+    def test_sync_flush_waits_for_in_flight_background_write(self):
+        """A newer synchronous flush cannot be overwritten by an older background write."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, write_behind=True)
+            mgr.local_dir = tmpdir
+            started, release = threading.Event(), threading.Event()
+            real_write = mgr._write
+
+            def slow_write(product_id, checkpoint, durable=False):
+                if checkpoint["cursor"] == 1:
+                    started.set()
+                    release.wait(timeout=2)
+                real_write(product_id, checkpoint, durable=durable)
+
+            with patch.object(mgr, "_write", side_effect=slow_write):
+                mgr.save("BTC-USD", {"cursor": 1})  # Background write, held open
+                assert started.wait(timeout=2)
+                mgr.save("BTC-USD", {"cursor": 2})
+                threading.Timer(0.1, release.set).start()
+                mgr.flush("BTC-USD")  # Blocks until the cursor=1 write finishes
+                mgr.close()
+
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 2
+
+    def test_stale_buffered_save_is_flushed_by_timer(self):
+        """A buffered save is persisted after min_interval_s even if no further save arrives."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(
+                s3_bucket="unused", s3_prefix="unused", use_s3=False,
+                min_interval_s=0.2, flush_every_n=1000, write_behind=True,
+            )
+            mgr.local_dir = tmpdir
+            path = os.path.join(tmpdir, "BTC-USD.json")
+
+            mgr.save("BTC-USD", {"cursor": 1})  # First save is due immediately
+            mgr.save("BTC-USD", {"cursor": 2})  # Buffered
+
+            deadline = time.monotonic() + 2
+            cursor = None
+            while time.monotonic() < deadline:
+                if os.path.exists(path):
+                    with open(path) as f:
+                        cursor = json.load(f)["cursor"]
+                    if cursor == 2:
+                        break
+                time.sleep(0.05)
+            mgr.close()
+            assert cursor == 2
+
+    def test_force_save_stays_synchronous(self):
+        """force=True persists before save() returns even with write-behind on."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(s3_bucket="unused", s3_prefix="unused", use_s3=False, write_behind=True)
+            mgr.local_dir = tmpdir
+
+            mgr.save("BTC-USD", {"cursor": 7}, force=True)
+            mgr.close()
+
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 7
+
+    def test_close_stops_writer_and_flushes_buffered_saves(self):
+        """close() joins the writer thread and persists anything still buffered."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mgr = CheckpointManager(
+                s3_bucket="unused", s3_prefix="unused", use_s3=False,
+                min_interval_s=3600, flush_every_n=1000, write_behind=True,
+            )
+            mgr.local_dir = tmpdir
+            mgr.save("BTC-USD", {"cursor": 1})  # Due: starts the writer
+            mgr.save("BTC-USD", {"cursor": 2})  # Buffered
+            writer = mgr._writer
+
+            mgr.close()
+
+            assert writer is not None and not writer.is_alive()
+            with open(os.path.join(tmpdir, "BTC-USD.json")) as f:
+                assert json.load(f)["cursor"] == 2
+
+            # Saves after close are written synchronously, without restarting the writer
+            mgr.save("BTC-USD", {"cursor": 3}, force=True)
+            mgr.save("BTC-USD", {"cursor": 4})
+            mgr.flush("BTC-USD")
+            assert mgr._writer is writer
+
+
+@pytest.fixture
+def lock_mgr(monkeypatch):
+    """LockManager wired to a stubbed DynamoDB client."""
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    mgr = LockManager(table_name="locks", ttl_seconds=600)
+    mgr.dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+    mgr.renewal_interval = 3600  # Keep renewals out of the way during tests
+    yield mgr
+    for lock_name in list(mgr._locks):
+        mgr._cancel_renewal(lock_name)
+
+
+class TestLockManagerBackoff:
+    """Tests for LockManager retry backoff while a lock is busy."""
+
+    def test_next_delay_stays_within_bounds(self):
+        """Decorrelated jitter delays stay between base and cap."""
+        delay = LOCK_RETRY_BASE_DELAY_SECONDS
+        for _ in range(100):
+            delay = _next_delay(delay, cap=5.0)
+            assert LOCK_RETRY_BASE_DELAY_SECONDS <= delay <= 5.0
+
+    def test_next_delay_respects_cap(self):
+        """A large previous delay is clamped to the cap."""
+        assert _next_delay(100.0, cap=0.5) == 0.5
+
+    def test_acquire_retries_with_short_jittered_delays(self, lock_mgr):
+        """A busy lock is retried with sub-cap delays instead of a fixed 5s sleep."""
+        stubber = Stubber(lock_mgr.dynamodb)
+        for _ in range(2):
+            stubber.add_client_error("put_item", service_error_code="ConditionalCheckFailedException")
+        stubber.add_response("put_item", {})
+
+        with stubber, patch("schemahub.checkpoint.time.sleep") as mock_sleep:
+            assert lock_mgr.acquire("ingest", wait=True, timeout=60)
+
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(delays) == 2
+        assert delays[0] == LOCK_RETRY_BASE_DELAY_SECONDS
+        assert all(d < 5 for d in delays)
+
+    def test_acquire_gives_up_after_timeout(self, lock_mgr):
+        """Waiting stops once the timeout budget is spent."""
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_client_error("put_item", service_error_code="ConditionalCheckFailedException")
+
+        with stubber, patch("schemahub.checkpoint.time.sleep") as mock_sleep:
+            assert lock_mgr.acquire("ingest", wait=True, timeout=0) is False
+
+        mock_sleep.assert_not_called()
+
+
+class TestLockManagerAcquire:
+    """Tests for LockManager.acquire conditional writes."""
+
+    def test_acquire_steals_expired_lock_in_one_put(self, lock_mgr):
+        """Acquire is a single conditional PutItem that also covers expired locks."""
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_response(
+            "put_item",
+            {},
+            {
+                "TableName": "locks",
+                "Item": ANY,
+                "ConditionExpression": "attribute_not_exists(lock_name) OR #ttl < :now",
+                "ExpressionAttributeNames": {"#ttl": "ttl"},
+                "ExpressionAttributeValues": {":now": ANY},
+            },
+        )
+
+        with stubber:
+            assert lock_mgr.acquire("ingest")
+            stubber.assert_no_pending_responses()
+
+        assert "ingest" in lock_mgr._locks
+
+    def test_acquire_derives_ttl_and_condition_from_one_clock_read(self, lock_mgr):
+        """The written TTL and the expiry comparison use the same timestamp."""
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_response(
+            "put_item",
+            {},
+            {
+                "TableName": "locks",
+                "Item": {
+                    "lock_name": {"S": "ingest"},
+                    "lock_id": {"S": lock_mgr.lock_id},
+                    "acquired_at": {"S": "2001-09-09T01:46:40.000000Z"},
+                    "ttl": {"N": "1000000600"},
+                },
+                "ConditionExpression": "attribute_not_exists(lock_name) OR #ttl < :now",
+                "ExpressionAttributeNames": {"#ttl": "ttl"},
+                "ExpressionAttributeValues": {":now": {"N": "1000000000"}},
+            },
+        )
+
+        with stubber, patch("schemahub.checkpoint.time.time", return_value=1_000_000_000.0):
+            assert lock_mgr.acquire("ingest")
+            stubber.assert_no_pending_responses()
+
+    def test_warmup_ignores_errors(self, lock_mgr):
+        """A failing warmup call never raises."""
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_client_error("describe_endpoints", service_error_code="AccessDeniedException")
+
+        with stubber:
+            lock_mgr.warmup()
+            stubber.assert_no_pending_responses()
+
+    def test_acquire_without_wait_fails_fast_on_held_lock(self, lock_mgr):
+        """A live lock held elsewhere costs exactly one request when not waiting."""
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_client_error("put_item", service_error_code="ConditionalCheckFailedException")
+
+        with stubber:
+            assert lock_mgr.acquire("ingest") is False
+            stubber.assert_no_pending_responses()
+
+
+class TestLockManagerRenewal:
+    """Tests for the shared renewal scheduler."""
+
+    def test_locks_share_one_renewal_thread(self, lock_mgr):
+        """Holding several locks does not spawn a thread per lock."""
+        with patch.object(lock_mgr.dynamodb, "put_item", return_value={}):
+            assert lock_mgr.acquire("ingest")
+            assert lock_mgr.acquire("transform")
+
+        renewal_threads = [t for t in threading.enumerate() if t.name.startswith("lock-renewal")]
+        assert len(renewal_threads) == 1
+        assert set(lock_mgr._locks) == {"ingest", "transform"}
+        assert all(state.renewal is not None for state in lock_mgr._locks.values())
+
+    def test_renewal_fires_and_reschedules(self, lock_mgr):
+        """A due renewal calls renew() and queues the next one."""
+        renewed = threading.Event()
+        lock_mgr.renewal_interval = 0.01
+        with patch.object(lock_mgr.dynamodb, "put_item", return_value={}):
+            assert lock_mgr.acquire("ingest")
+        with patch.object(lock_mgr, "renew", side_effect=lambda name: renewed.set()):
+            assert renewed.wait(timeout=2)
+        assert lock_mgr._locks["ingest"].renewal is not None
+
+    def test_renewal_skipped_when_heartbeat_is_stale(self, lock_mgr):
+        """A heartbeated lock whose holder stalled is left to expire."""
+        state = _LockState(acquired_at=0.0, renewal=MagicMock())
+        lock_mgr._locks["ingest"] = state
+        lock_mgr.heartbeat("ingest")
+        state.last_heartbeat -= lock_mgr.ttl_seconds
+
+        with patch.object(lock_mgr, "renew") as mock_renew, patch.object(LockManager, "_scheduler"):
+            lock_mgr._renew_and_reschedule("ingest", state)
+
+        mock_renew.assert_not_called()
+
+    def test_renewal_continues_with_recent_heartbeat(self, lock_mgr):
+        """Fresh heartbeats (or none at all) keep the lock renewed."""
+        for name in ("ingest", "transform"):
+            lock_mgr._locks[name] = _LockState(acquired_at=0.0, renewal=MagicMock())
+        lock_mgr.heartbeat("ingest")
+
+        with patch.object(lock_mgr, "renew") as mock_renew, patch.object(LockManager, "_scheduler"):
+            for name in ("ingest", "transform"):
+                lock_mgr._renew_and_reschedule(name, lock_mgr._locks[name])
+
+        assert [c.args[0] for c in mock_renew.call_args_list] == ["ingest", "transform"]
+
+    def test_stale_renewal_stops_after_reacquire(self, lock_mgr):
+        """A renewal belonging to a replaced lock state does not reschedule itself."""
+        old_state = _LockState(acquired_at=0.0, renewal=MagicMock())
+        lock_mgr._locks["ingest"] = _LockState(acquired_at=1.0, renewal=MagicMock())
+
+        with patch.object(lock_mgr, "renew"), patch.object(LockManager, "_scheduler") as mock_scheduler:
+            lock_mgr._renew_and_reschedule("ingest", old_state)
+
+        mock_scheduler.enter.assert_not_called()
+
+    def test_release_cancels_renewal_without_blocking(self, lock_mgr):
+        """Release drops the scheduled renewal immediately."""
+        with patch.object(lock_mgr.dynamodb, "put_item", return_value={}):
+            assert lock_mgr.acquire("ingest")
+        with patch.object(lock_mgr.dynamodb, "delete_item", return_value={}):
+            assert lock_mgr.release("ingest")
+
+        assert "ingest" not in lock_mgr._locks
+        assert lock_mgr._scheduler.empty()
+
+    def test_renew_sends_holder_condition(self, lock_mgr):
+        """Renew extends the TTL only while this instance still holds the lock."""
+        lock_mgr._locks["ingest"] = _LockState(acquired_at=0.0)
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_response(
+            "update_item",
+            {},
+            {
+                "TableName": "locks",
+                "Key": {"lock_name": {"S": "ingest"}},
+                "UpdateExpression": "SET #ttl = :ttl, renewed_at = :renewed",
+                "ConditionExpression": "lock_id = :id",
+                "ExpressionAttributeNames": {"#ttl": "ttl"},
+                "ExpressionAttributeValues": {
+                    ":ttl": ANY,
+                    ":renewed": ANY,
+                    ":id": {"S": lock_mgr.lock_id},
+                },
+            },
+        )
+
+        with stubber:
+            assert lock_mgr.renew("ingest")
+            stubber.assert_no_pending_responses()
+
+
+class TestLockManagerReleaseAll:
+    """Tests for batched lock release."""
+
+    def test_release_all_uses_one_transaction(self, lock_mgr):
+        """Several held locks are released in a single TransactWriteItems call."""
+        lock_mgr._locks.update({name: _LockState(acquired_at=0.0) for name in ("ingest", "transform")})
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_response("transact_write_items", {}, {"TransactItems": ANY})
+
+        with stubber:
+            lock_mgr.release_all()
+            stubber.assert_no_pending_responses()
+
+        assert not lock_mgr._locks
+
+    def test_release_all_falls_back_when_transaction_cancelled(self, lock_mgr):
+        """A cancelled transaction (e.g. one lock stolen) releases locks one by one."""
+        lock_mgr._locks.update({name: _LockState(acquired_at=0.0) for name in ("ingest", "transform")})
+        stubber = Stubber(lock_mgr.dynamodb)
+        stubber.add_client_error("transact_write_items", service_error_code="TransactionCanceledException")
+        stubber.add_response("delete_item", {})
+        stubber.add_client_error("delete_item", service_error_code="ConditionalCheckFailedException")
+
+        with stubber:
+            lock_mgr.release_all()
+            stubber.assert_no_pending_responses()
+
+        assert not lock_mgr._locks
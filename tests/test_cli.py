@@ -0,0 +1,157 @@
+"""Tests for the CLI entry point."""
+import json
+import math
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from schemahub import cli
+from schemahub.checkpoint import CheckpointManager
+from schemahub.connectors.coinbase import CoinbaseConnector, CoinbaseTrade
+
+
+class TestIngestProductLockRelease:
+    """Tests for per-product cleanup in the ingest command."""
+
+    def test_checkpoint_flush_failure_still_releases_lock(self, tmp_path, monkeypatch):
+        """A failing checkpoint write neither keeps the product lock nor aborts other products."""
+        monkeypatch.chdir(tmp_path)
+
+        connector = MagicMock()
+        connector.load_product_seed.return_value = (["BAD-USD", "GOOD-USD"], {})
+        connector.get_latest_trade_id.return_value = 5000
+
+        lock_mgr = MagicMock()
+        lock_mgr.acquire.return_value = True
+        lock_mgr.acquire_product_lock.return_value = True
+
+        def fake_ingest(product_id, checkpoint_mgr, **kwargs):
+            checkpoint_mgr.save(product_id, {"cursor": 4000})
+            return {"records_written": 10, "final_cursor": 4000, "checkpoint_ts": "now"}
+
+        real_write = CheckpointManager._write
+        released_locks = set()
+        late_writes = []
+        lock_mgr.release_product_lock.side_effect = lambda source, pid: released_locks.add(pid)
+        lock_mgr.release.side_effect = released_locks.add
+
+        def failing_write(self, product_id, checkpoint, durable=False):
+            if product_id in released_locks or "ingest" in released_locks:
+                # S3 is back by now; a write here would race the lock's next holder
+                late_writes.append(product_id)
+            elif product_id == "BAD-USD":
+                raise RuntimeError("S3 unavailable")
+            real_write(self, product_id, checkpoint, durable=durable)
+
+        with patch.object(cli, "CoinbaseConnector", return_value=connector), \
+                patch.object(cli, "get_lock_manager", return_value=lock_mgr), \
+                patch.object(cli, "ingest_coinbase", side_effect=fake_ingest) as mock_ingest, \
+                patch.object(cli, "get_metrics_client"), \
+                patch.object(cli, "flush_metrics"), \
+                patch.object(CheckpointManager, "_write", failing_write):
+            cli.main(["ingest", "--s3-bucket", "bucket", "--workers", "2"])
+
+        assert {c.kwargs["product_id"] for c in mock_ingest.call_args_list} == {"BAD-USD", "GOOD-USD"}
+        released = {c.args[1] for c in lock_mgr.release_product_lock.call_args_list}
+        assert released == {"BAD-USD", "GOOD-USD"}
+        lock_mgr.release.assert_called_once_with("ingest")
+        assert not any(t.name == "checkpoint-writer" and t.is_alive() for t in threading.enumerate())
+        # No checkpoint is written after its product lock or the ingest lock is released
+        assert late_writes == []
+        assert not (tmp_path / "state" / "BAD-USD.json").exists()
+        assert (tmp_path / "state" / "GOOD-USD.json").exists()
+
+
+class TestIngestParser:
+    """Tests for ingest argument validation."""
+
+    @pytest.mark.parametrize("value", ["0", "-1"])
+    def test_s3_upload_concurrency_must_be_positive(self, value):
+        """Non-positive upload concurrency is a usage error, not a mid-run failure."""
+        with pytest.raises(SystemExit):
+            cli.build_parser().parse_args(["ingest", "--s3-upload-concurrency", value])
+
+    def test_s3_upload_concurrency_accepts_positive(self):
+        """A positive upload concurrency parses to an int."""
+        args = cli.build_parser().parse_args(["ingest", "--s3-upload-concurrency", "4"])
+
+        assert args.s3_upload_concurrency == 4
+
+    @pytest.mark.parametrize("value", ["0", "-5"])
+    def test_flush_rows_must_be_positive(self, value):
+        """A zero batch size would stall the parallel cursor, so it is rejected."""
+        with pytest.raises(SystemExit):
+            cli.build_parser().parse_args(["ingest", "--flush-rows", value])
+
+    def test_flush_options_parse(self):
+        """Flush thresholds parse to trades, bytes and seconds."""
+        args = cli.build_parser().parse_args(
+            ["ingest", "--flush-rows", "5000", "--flush-mib", "8", "--flush-seconds", "10"]
+        )
+
+        assert args.cache_batch_size == 5000
+        assert args.max_batch_bytes == 8 * cli.MIB
+        assert args.max_batch_age_s == 10
+
+
+class TestIngestCoinbaseSequentialFlush:
+    """Tests for batch flush thresholds in sequential ingest."""
+
+    @staticmethod
+    def _connector(latest: int) -> MagicMock:
+        def fetch(product_id, limit, after):
+            ids = [i for i in range(after - 1, max(after - 1 - limit, 0), -1) if i <= latest]
+            trades = [
+                CoinbaseTrade(trade_id=i, price="1.0", size="2.0", time="2024-01-01T00:00:00Z", side="buy")
+                for i in ids
+            ]
+            return trades, None
+
+        connector = MagicMock()
+        connector.fetch_trades_with_cursor.side_effect = fetch
+        connector.to_raw_record = CoinbaseConnector.to_raw_record
+        return connector
+
+    def _run(self, **kwargs) -> list[str]:
+        keys = []
+        with patch.object(cli, "put_jsonl_s3", side_effect=lambda payload, bucket, key, **kw: keys.append(key)):
+            cli.ingest_coinbase(
+                "BTC-USD", 100, "bucket", "prefix", cursor=1000, target_trade_id=1300, run_id="run",
+                connector=self._connector(1300), **kwargs,
+            )
+        return keys
+
+    def test_batch_within_thresholds_is_one_object(self):
+        """Pages accumulate into one object while no threshold trips."""
+        assert len(self._run()) == 1
+
+    def test_batch_age_bound_flushes_each_page(self):
+        """With a zero age bound, every page is flushed as soon as it is added."""
+        keys = self._run(max_batch_age_s=0)
+
+        assert len(keys) > 1
+        # Keys end in _{first_id}_{last_id}_{count}.jsonl; pages never span objects
+        assert all(int(key.rsplit("_", 1)[1].split(".")[0]) <= 100 for key in keys)
+
+
+class TestPrintSummary:
+    """Tests for the one-line JSON run summary."""
+
+    def test_summary_is_one_json_line(self, capsys):
+        """A finite summary is written as a single parseable line."""
+        cli._print_summary({"records_written": 10, "rate": 2.5})
+
+        out = capsys.readouterr().out
+        assert out.count("\n") == 1
+        assert json.loads(out) == {"records_written": 10, "rate": 2.5}
+
+    def test_non_finite_metrics_are_not_nulled(self, capsys):
+        """NaN/Infinity metrics keep json.dumps' tokens instead of becoming null."""
+        cli._print_summary({"rate": float("nan"), "nested": {"ratio": float("inf")}})
+
+        out = capsys.readouterr().out
+        assert "null" not in out
+        parsed = json.loads(out)
+        assert math.isnan(parsed["rate"])
+        assert parsed["nested"]["ratio"] == float("inf")
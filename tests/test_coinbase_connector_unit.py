@@ -1,11 +1,12 @@
 """Unit tests for CoinbaseTrade and CoinbaseConnector."""
+import json
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 from urllib.parse import urlparse
 
 import pytest
 
-from schemahub.connectors.coinbase import CoinbaseTrade, CoinbaseConnector, _parse_time, COINBASE_API_URL
+from schemahub.connectors.coinbase import CoinbaseTrade, CoinbaseConnector, _parse_time, _retry_delay, COINBASE_API_URL
 
 
 class TestCoinbaseApiUrl:
@@ -42,6 +43,10 @@ class DummyResponse:
     def json(self):
         return self._payload
 
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
+
 
 class DummySession:
     """Mock session object for testing."""
@@ -170,6 +175,40 @@ class TestParseTime:
         
         assert result.tzinfo == timezone.utc
 
+    def test_parse_time_converts_offset_to_utc(self):
+        """An explicit non-UTC offset is shifted onto UTC."""
+        result = _parse_time("2024-06-01T14:00:00+02:00")
+
+        assert result == datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+        assert result.tzinfo is timezone.utc
+
+
+class TestRetryDelay:
+    """Tests for _retry_delay backoff."""
+
+    def test_delay_grows_with_attempts_and_is_capped(self):
+        """Delays fall in the upper half of a doubling window, capped at the max."""
+        for attempt, window in [(1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)]:
+            for _ in range(20):
+                delay = _retry_delay(attempt)
+                assert window / 2 <= delay <= window
+
+    def test_delay_is_jittered(self):
+        """Concurrent retries of the same attempt do not all sleep the same time."""
+        assert len({_retry_delay(4) for _ in range(20)}) > 1
+
+    def test_numeric_retry_after_header_wins(self):
+        """A numeric Retry-After header is used as the delay."""
+        response = MagicMock(headers={"Retry-After": "3"})
+
+        assert _retry_delay(1, response) == 3.0
+
+    def test_http_date_retry_after_falls_back_to_backoff(self):
+        """A non-numeric Retry-After header falls back to computed backoff."""
+        response = MagicMock(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        assert 0.5 <= _retry_delay(1, response) <= 1.0
+
 
 class TestCoinbaseConnectorFetchTrades:
     """Tests for fetch_trades_with_cursor method."""
@@ -289,6 +328,21 @@ class TestCoinbaseConnectorFetchTrades:
         assert trades == []
 
 
+class TestCoinbaseConnectorFetchProducts:
+    """Tests for CoinbaseConnector.fetch_products."""
+
+    def test_fetch_products_uses_connector_session(self):
+        """The product catalogue is fetched through the connector's session."""
+        payload = [{"id": "BTC-USD"}, {"id": "ETH-USD"}]
+        session = DummySession(payload)
+        connector = CoinbaseConnector(session=session)
+
+        products = connector.fetch_products()
+
+        assert products == payload
+        assert session.last_url == f"{COINBASE_API_URL}/products"
+
+
 class TestCoinbaseConnectorToRawRecord:
     """Tests for to_raw_record method."""
 
@@ -445,6 +499,13 @@ class TestCoinbaseConnectorInitialization:
         
         assert connector.session is dummy_session
 
+    def test_init_pool_maxsize_mounts_sized_adapter(self):
+        """pool_maxsize sizes the HTTPS connection pool of an internal session."""
+        connector = CoinbaseConnector(pool_maxsize=32)
+
+        adapter = connector.session.get_adapter(COINBASE_API_URL)
+        assert adapter._pool_maxsize == 32
+
     def test_init_sets_user_agent(self):
         """CoinbaseConnector sets User-Agent header."""
         connector = CoinbaseConnector()
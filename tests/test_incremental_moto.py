@@ -6,7 +6,8 @@ import pytest
 from moto import mock_aws
 
 from schemahub.manifest import load_manifest, update_manifest_after_transform
-from schemahub.transform import transform_raw_to_unified
+from schemahub.raw_writer import encode_jsonl, put_jsonl_s3
+from schemahub.transform import fetch_file_content, list_raw_files_from_s3, transform_raw_to_unified
 
 
 def _put_jsonl(s3_client, bucket: str, key: str, records: list[dict]):
@@ -204,3 +205,22 @@ def test_missing_manifest_falls_back_to_full_refresh():
 
     assert result["records_read"] == 2
     assert set(result["processed_files"]) == {key_a, key_b}
+
+
+@mock_aws
+def test_gzip_raw_files_are_listed_and_decompressed(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    bucket = "test-bucket"
+    raw_prefix = "schemahub/raw_coinbase_trades/test-gzip"
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=bucket)
+
+    records = [{"id": "G-1", "product_id": "BTC-USD", "side": "BUY", "price": "100", "size": "0.01", "time": datetime.now(timezone.utc).isoformat()}]
+    plain_key = f"{raw_prefix}/raw_a.jsonl"
+    gzip_key = f"{raw_prefix}/raw_b.jsonl.gz"
+    _put_jsonl(s3, bucket, plain_key, records)
+    put_jsonl_s3(encode_jsonl(records), bucket=bucket, key=gzip_key, s3_client=s3, compression="gzip")
+
+    assert list_raw_files_from_s3(bucket, raw_prefix) == [plain_key, gzip_key]
+    assert fetch_file_content(s3, bucket, gzip_key) == (gzip_key, records)
@@ -18,7 +18,7 @@ def test_write_jsonl_s3_puts_object_payload():
         }
     ]
 
-    expected_body = b'{"trade_id": "1", "time": "2024-06-01T12:00:00+00:00", "price": 100.5}\n'
+    expected_body = b'{"trade_id":"1","time":"2024-06-01T12:00:00+00:00","price":100.5}\n'
     stubber.add_response(
         "put_object",
         {},
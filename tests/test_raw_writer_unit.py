@@ -6,7 +6,7 @@ import boto3
 import pytest
 from botocore.stub import Stubber
 
-from schemahub.raw_writer import write_jsonl_s3, _default_serializer
+from schemahub.raw_writer import BackgroundUploader, compress_jsonl, encode_jsonl, put_jsonl_s3, write_jsonl_s3, _default_s3_client, _default_serializer
 
 
 class TestDefaultSerializer:
@@ -76,7 +76,7 @@ class TestWriteJsonlS3:
             {
                 "Bucket": "my-bucket",
                 "Key": "trades/data.jsonl",
-                "Body": b'{"trade_id": "123", "price": 35000.5, "time": "2024-06-01T12:00:00+00:00"}\n',
+                "Body": b'{"trade_id":"123","price":35000.5,"time":"2024-06-01T12:00:00+00:00"}\n',
             },
         )
         
@@ -94,7 +94,7 @@ class TestWriteJsonlS3:
         ]
         
         # The body should have two lines
-        expected_body = b'{"id": 1, "value": "a"}\n{"id": 2, "value": "b"}\n'
+        expected_body = b'{"id":1,"value":"a"}\n{"id":2,"value":"b"}\n'
         
         stubber.add_response(
             "put_object",
@@ -194,6 +194,7 @@ class TestWriteJsonlS3:
 
     def test_write_uses_default_s3_client_when_none_provided(self):
         """write_jsonl_s3 creates default S3 client when none provided."""
+        _default_s3_client.cache_clear()
         with patch("schemahub.raw_writer.boto3.client") as mock_boto3:
             mock_client = MagicMock()
             mock_boto3.return_value = mock_client
@@ -206,6 +207,20 @@ class TestWriteJsonlS3:
                 
                 # Verify boto3.client was called
                 assert mock_boto3.called
+        _default_s3_client.cache_clear()
+
+    def test_default_s3_client_is_reused_across_writes(self):
+        """Writes without an explicit client share one cached client."""
+        _default_s3_client.cache_clear()
+        with patch("schemahub.raw_writer.boto3.client") as mock_boto3:
+            mock_boto3.return_value = MagicMock()
+
+            write_jsonl_s3([{"data": 1}], bucket="bucket", key="a.jsonl")
+            write_jsonl_s3([{"data": 2}], bucket="bucket", key="b.jsonl")
+
+            assert mock_boto3.call_count == 1
+            assert mock_boto3.return_value.put_object.call_count == 2
+        _default_s3_client.cache_clear()
 
     def test_write_preserves_field_order_in_json(self):
         """Writing records preserves the order of fields in JSON."""
@@ -317,3 +332,142 @@ class TestWriteJsonlS3:
         with stubber:
             # Should complete without error - lists are serialized
             write_jsonl_s3(records, bucket="bucket", key="key", s3_client=client)
+
+    def test_write_accepts_generator(self):
+        """Records can be streamed from a generator without building a list."""
+        client = boto3.client("s3", region_name="us-east-1")
+        stubber = Stubber(client)
+
+        records = ({"id": i} for i in range(3))
+
+        stubber.add_response(
+            "put_object",
+            {},
+            {
+                "Bucket": "bucket",
+                "Key": "key",
+                "Body": b'{"id":0}\n{"id":1}\n{"id":2}\n',
+            },
+        )
+
+        with stubber:
+            write_jsonl_s3(records, bucket="bucket", key="key", s3_client=client)
+            stubber.assert_no_pending_responses()
+
+
+class TestEncodeJsonl:
+    """Tests for encode_jsonl / put_jsonl_s3."""
+
+    def test_encode_matches_write_jsonl_body(self):
+        """Pre-encoded payloads upload the same bytes write_jsonl_s3 would send."""
+        records = [{"id": 1, "time": datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)}]
+        payload = encode_jsonl(records)
+        assert payload == b'{"id":1,"time":"2024-06-01T12:00:00+00:00"}\n'
+
+        client = boto3.client("s3", region_name="us-east-1")
+        stubber = Stubber(client)
+        stubber.add_response("put_object", {}, {"Bucket": "bucket", "Key": "key", "Body": payload})
+
+        with stubber:
+            put_jsonl_s3(payload, bucket="bucket", key="key", s3_client=client)
+            stubber.assert_no_pending_responses()
+
+    def test_encode_naive_datetime_as_utc(self):
+        """Naive datetimes are written with an explicit UTC offset."""
+        payload = encode_jsonl([{"ts": datetime(2024, 6, 1, 12, 0, 0, 123456)}])
+        assert payload == b'{"ts":"2024-06-01T12:00:00.123456+00:00"}\n'
+
+    def test_encode_empty_records(self):
+        """No records encode to an empty payload."""
+        assert encode_jsonl([]) == b""
+
+    def test_gzip_compression_round_trips(self):
+        """gzip output is deterministic and decompresses to the original payload."""
+        import gzip
+
+        payload = encode_jsonl([{"id": i, "side": "BUY"} for i in range(100)])
+        compressed = compress_jsonl(payload, "gzip")
+
+        assert gzip.decompress(compressed) == payload
+        assert len(compressed) < len(payload)
+        assert compress_jsonl(payload, "gzip") == compressed  # mtime=0
+
+    def test_unknown_compression_raises(self):
+        """Unsupported codecs are rejected rather than uploaded uncompressed."""
+        with pytest.raises(ValueError, match="Unsupported raw compression"):
+            compress_jsonl(b"{}\n", "lz4")
+
+    def test_large_payload_uses_multipart_upload(self):
+        """Payloads over the threshold are uploaded as multipart parts and reassemble intact."""
+        from moto import mock_aws
+
+        line = b'{"trade_id": "1", "pad": "' + b"x" * 1000 + b'"}\n'
+        payload = line * (12 * 1024)  # ~12 MiB
+
+        with mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="bucket")
+            with patch.object(client, "put_object", wraps=client.put_object) as mock_put:
+                put_jsonl_s3(
+                    payload,
+                    bucket="bucket",
+                    key="big.jsonl",
+                    s3_client=client,
+                    multipart_threshold=6 * 1024 * 1024,
+                    part_size=5 * 1024 * 1024,
+                )
+
+            mock_put.assert_not_called()
+            obj = client.get_object(Bucket="bucket", Key="big.jsonl")
+            assert obj["Body"].read() == payload
+            assert obj["ETag"].strip('"').endswith("-3")  # Multipart ETag: 3 parts
+
+
+class TestBackgroundUploader:
+    """Tests for BackgroundUploader."""
+
+    def test_submit_returns_while_upload_runs(self):
+        """The caller is free to keep working while the upload is in flight."""
+        import threading
+
+        started, release = threading.Event(), threading.Event()
+
+        def upload():
+            started.set()
+            release.wait(timeout=2)
+
+        with BackgroundUploader() as uploader:
+            uploader.submit(upload)
+            assert started.wait(timeout=2)
+            release.set()
+
+    def test_work_runs_in_submission_order(self):
+        """Each submit waits for the previous upload, so side effects stay ordered."""
+        done = []
+        with BackgroundUploader() as uploader:
+            for i in range(5):
+                uploader.submit(done.append, i)
+        assert done == [0, 1, 2, 3, 4]
+
+    def test_failure_surfaces_on_next_submit(self):
+        """A failed upload is raised to the caller and later work is not run."""
+        done = []
+
+        def fail():
+            raise RuntimeError("upload failed")
+
+        uploader = BackgroundUploader()
+        uploader.submit(fail)
+        with pytest.raises(RuntimeError, match="upload failed"):
+            uploader.submit(done.append, 1)
+        uploader.close()
+        assert done == []
+
+    def test_clean_exit_raises_pending_failure(self):
+        """Leaving the block without an error still reports a failed last upload."""
+        def fail():
+            raise RuntimeError("last upload failed")
+
+        with pytest.raises(RuntimeError, match="last upload failed"):
+            with BackgroundUploader() as uploader:
+                uploader.submit(fail)
@@ -114,6 +114,26 @@ class TestLoadProductSeed:
             assert isinstance(result[1], dict)
 
 
+    def test_load_seed_is_cached_until_file_changes(self):
+        """Repeated loads of an unchanged file parse it once; a rewrite is re-read."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            seed_path = os.path.join(tmpdir, "seed.yaml")
+            CoinbaseConnector.save_product_seed(["BTC-USD"], seed_path)
+
+            with patch("schemahub.connectors.coinbase.yaml.load", wraps=yaml.load) as mock_load:
+                ids1, _ = CoinbaseConnector.load_product_seed(seed_path)
+                ids1.append("MUTATED")  # Must not leak into the cache
+                ids2, _ = CoinbaseConnector.load_product_seed(seed_path)
+                assert mock_load.call_count == 1
+
+                CoinbaseConnector.save_product_seed(["BTC-USD", "ETH-USD"], seed_path)
+                ids3, _ = CoinbaseConnector.load_product_seed(seed_path)
+                assert mock_load.call_count == 2
+
+            assert ids2 == ["BTC-USD"]
+            assert ids3 == ["BTC-USD", "ETH-USD"]
+
+
 class TestSaveProductSeed:
     """Tests for saving product seed files."""
 
@@ -186,6 +206,18 @@ class TestSaveProductSeed:
             assert isinstance(saved_data["product_ids"], list)
             assert set(saved_data["product_ids"]) == {"BTC-USD", "ETH-USD"}
 
+    def test_save_seed_accepts_generator_and_returns_count(self):
+        """A one-shot generator is written in full and the count is returned."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            seed_path = os.path.join(tmpdir, "seed.yaml")
+
+            written = CoinbaseConnector.save_product_seed((p for p in ["BTC-USD", "ETH-USD"]), seed_path)
+
+            with open(seed_path, "r") as f:
+                saved_data = yaml.safe_load(f)
+            assert written == 2
+            assert saved_data["product_ids"] == ["BTC-USD", "ETH-USD"]
+
     def test_save_seed_uses_atomic_write(self):
         """Saving a seed file uses atomic write (tmp then rename)."""
         with tempfile.TemporaryDirectory() as tmpdir: